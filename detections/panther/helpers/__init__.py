@@ -15,6 +15,7 @@ if str(panther_mock_path) not in sys.path:
 from helpers import (
     deep_get,
     deep_walk,
+    deep_walk_first,
     pattern_match,
     pattern_match_list,
     is_ip_in_network,
@@ -29,6 +30,7 @@ from helpers import (
 __all__ = [
     "deep_get",
     "deep_walk",
+    "deep_walk_first",
     "pattern_match",
     "pattern_match_list",
     "is_ip_in_network",
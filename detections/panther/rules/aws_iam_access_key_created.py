@@ -11,6 +11,9 @@ LOG_TYPES = ["AWS.CloudTrail"]
 ENABLED = True
 TAGS = ["AWS", "Persistence", "Credential Access", "T1098"]
 
+# Field values rule() requires; the engine skips other events without calling it
+PREFILTER = [("eventName", "CreateAccessKey")]
+
 
 def rule(event):
     """
@@ -26,6 +29,19 @@ def rule(event):
     )
 
 
+def rule_prefilter(df):
+    """
+    Vectorized necessary condition for rule() over a DataFrame of flattened
+    events. DetectionEngine.run_vectorized only calls rule() where it holds.
+    """
+    created = df["eventName"] == "CreateAccessKey"
+    # An object-valued errorCode ({} or {"code": None} included) leaves no
+    # non-null errorCode column, so rule() settles the rows that get through
+    if "errorCode" not in df:
+        return created
+    return created & df["errorCode"].isna()
+
+
 def title(event):
     """Generate alert title."""
     actor = deep_get(event, "userIdentity", "arn", default="unknown")
@@ -11,6 +11,9 @@ LOG_TYPES = ["AWS.CloudTrail"]
 ENABLED = True
 TAGS = ["AWS", "Initial Access", "T1078"]
 
+# Field values rule() requires; the engine skips other events without calling it
+PREFILTER = [("eventName", "ConsoleLogin")]
+
 
 def rule(event):
     """
@@ -26,6 +29,14 @@ def rule(event):
     )
 
 
+def rule_vectorized(df):
+    """
+    Vectorized rule() over a DataFrame of flattened events.
+    Used by DetectionEngine.run_vectorized for batch replay.
+    """
+    return (df["eventName"] == "ConsoleLogin") & (df["userIdentity.type"] == "Root")
+
+
 def title(event):
     """Generate alert title."""
     source_ip = event.get("sourceIPAddress", "unknown")
@@ -41,6 +52,17 @@ def severity(event):
     return "HIGH" if not mfa_used else "MEDIUM"
 
 
+def severity_vectorized(df):
+    """
+    Vectorized severity() over a DataFrame of flattened events.
+    Used by DetectionEngine.run_vectorized for batch replay.
+    """
+    mfa_used = df.get("additionalEventData.MFAUsed")
+    if mfa_used is None:
+        return ["HIGH"] * len(df)
+    return (mfa_used == "Yes").map({True: "MEDIUM", False: "HIGH"})
+
+
 def description(event):
     """Generate detailed description."""
     return (
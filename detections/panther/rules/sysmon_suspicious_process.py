@@ -5,13 +5,18 @@ Detects execution of commonly abused binaries that may indicate
 malicious activity or living-off-the-land techniques.
 """
 
-from helpers import deep_get, pattern_match_list
+from helpers import deep_get
 
 LOG_TYPES = ["Custom.Sysmon"]
 ENABLED = True
 TAGS = ["Endpoint", "Execution", "Defense Evasion", "T1059"]
 
-# Suspicious process patterns (case insensitive matching)
+# Field values rule() requires; the engine skips other events without calling it
+PREFILTER = [("EventID", 1)]
+
+# Suspicious process patterns (case insensitive matching).
+# Process and parent patterns must keep the "*\\name.exe" form, which rule()
+# checks as a basename lookup.
 SUSPICIOUS_PROCESSES = [
     "*\\powershell.exe",
     "*\\cmd.exe",
@@ -25,7 +30,7 @@ SUSPICIOUS_PROCESSES = [
     "*\\msiexec.exe",
 ]
 
-# Suspicious command line patterns
+# Suspicious command line patterns, each of the "*substring*" form
 SUSPICIOUS_COMMANDS = [
     "*-enc*",  # Encoded PowerShell
     "*-encodedcommand*",
@@ -49,6 +54,35 @@ SUSPICIOUS_PARENTS = [
 ]
 
 
+def _basename_set(patterns):
+    """Lowercased basenames from a list of "*\\name" patterns."""
+    return frozenset(p[2:].lower() for p in patterns)
+
+
+def _minimal_substrings(patterns):
+    """
+    Lowercased substrings from a list of "*substring*" patterns, dropping
+    any that contain another (a command line containing "-encodedcommand"
+    always contains "-enc", so checking both is redundant).
+    """
+    substrings = list(dict.fromkeys(p.strip("*").lower() for p in patterns))
+    return tuple(s for s in substrings if not any(o != s and o in s for o in substrings))
+
+
+def _basename(path):
+    """Lowercased text after the last backslash, or None if there isn't one."""
+    _, sep, name = path.rpartition("\\")
+    return name.lower() if sep else None
+
+
+# Built once at import so each event costs a set lookup per path and plain
+# substring checks for the command line
+_PROC_NAMES = _basename_set(SUSPICIOUS_PROCESSES)
+_CMD_SUBSTRINGS = _minimal_substrings(SUSPICIOUS_COMMANDS)
+_PARENT_NAMES = _basename_set(SUSPICIOUS_PARENTS)
+_OFFICE_NAMES = frozenset({"winword.exe", "excel.exe", "outlook.exe", "powerpnt.exe"})
+
+
 def rule(event):
     """
     Detect suspicious process execution.
@@ -63,27 +97,27 @@ def rule(event):
     if event.get("EventID") != 1:
         return False
 
-    image = (event.get("Image") or "").lower()
-    command_line = (event.get("CommandLine") or "").lower()
-    parent_image = (event.get("ParentImage") or "").lower()
-
-    # Check for suspicious process
-    is_suspicious_process = pattern_match_list(image, [p.lower() for p in SUSPICIOUS_PROCESSES])
-
-    # Check for suspicious command line
-    has_suspicious_command = pattern_match_list(command_line, [p.lower() for p in SUSPICIOUS_COMMANDS])
-
-    # Check for suspicious parent
-    has_suspicious_parent = pattern_match_list(parent_image, [p.lower() for p in SUSPICIOUS_PARENTS])
+    # Every alert requires a suspicious process, so bail out early for the
+    # common benign case before touching the command line or parent
+    if _basename(event.get("Image") or "") not in _PROC_NAMES:
+        return False
 
     # Alert if suspicious process with suspicious command OR suspicious parent spawning shell
-    if is_suspicious_process and has_suspicious_command:
-        return True
+    command_line = (event.get("CommandLine") or "").lower()
+    for substring in _CMD_SUBSTRINGS:
+        if substring in command_line:
+            return True
+
+    return _basename(event.get("ParentImage") or "") in _PARENT_NAMES
 
-    if has_suspicious_parent and is_suspicious_process:
-        return True
 
-    return False
+def rule_prefilter(df):
+    """
+    Vectorized necessary condition for rule() over a DataFrame of flattened
+    events. DetectionEngine.run_vectorized only calls rule() where it holds.
+    """
+    basenames = df["Image"].str.lower().str.rpartition("\\")[2]
+    return (df["EventID"] == 1) & basenames.isin(_PROC_NAMES)
 
 
 def title(event):
@@ -98,15 +132,14 @@ def title(event):
 def severity(event):
     """Determine severity based on indicators."""
     command_line = (event.get("CommandLine") or "").lower()
-    parent_image = (event.get("ParentImage") or "").lower()
 
     # Higher severity for encoded commands
     if "encodedcommand" in command_line or "-enc" in command_line:
         return "HIGH"
 
     # Higher severity for Office spawning shells
-    office_apps = ["winword", "excel", "outlook", "powerpnt"]
-    if any(app in parent_image for app in office_apps):
+    parent_name = (event.get("ParentImage") or "").rpartition("\\")[2].lower()
+    if parent_name in _OFFICE_NAMES:
         return "HIGH"
 
     return "MEDIUM"
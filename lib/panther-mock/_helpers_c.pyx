@@ -0,0 +1,41 @@
+# cython: language_level=3
+"""
+Compiled versions of the hottest Panther helper functions.
+Build with `make build-ext`; helpers.py falls back to the pure-Python
+implementations when this extension is not available.
+"""
+
+from cpython.dict cimport PyDict_GetItemWithError
+from cpython.object cimport PyObject
+
+
+def deep_get(event, *keys, default=None):
+    """
+    Safely retrieve nested values from a dictionary.
+
+    Same behaviour as helpers.deep_get, but plain dict levels are read with
+    PyDict_GetItemWithError instead of a bound ``.get`` call, which raises
+    for unhashable keys just as ``.get`` does. Dict subclasses still go
+    through their own ``.get``.
+    """
+    cdef object result = event
+    cdef PyObject* item
+
+    for key in keys:
+        if type(result) is dict:
+            item = PyDict_GetItemWithError(result, key)
+            if item is NULL:
+                return default
+            result = <object>item
+        elif isinstance(result, dict):
+            result = result.get(key)
+        elif isinstance(result, list) and isinstance(key, int):
+            try:
+                result = result[key]
+            except (IndexError, TypeError):
+                return default
+        else:
+            return default
+        if result is None:
+            return default
+    return result if result is not None else default
@@ -4,23 +4,50 @@ Executes detection rules against log events.
 """
 
 import importlib.util
-import json
+import itertools
+import os
 import sys
-import traceback
-from dataclasses import dataclass, field
-from datetime import datetime
+import threading
+import time
+from dataclasses import dataclass, field, fields
 from pathlib import Path
-from typing import Any, Callable, Dict, List, Optional, Union
+from types import ModuleType
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
 try:
     from .helpers import deep_get
-    from .schemas import LogType, validate_event
 except ImportError:
     from helpers import deep_get
-    from schemas import LogType, validate_event
 
 
-@dataclass
+# json/orjson, traceback and concurrent.futures are imported where they are
+# used, so loading the engine doesn't pay for them up front
+
+# Executed rule modules keyed by resolved path, tagged with the file's mtime
+# and size (the same check CPython uses for .pyc files) so an edited rule is
+# re-imported on its next load
+_MODULE_CACHE: Dict[Path, Tuple[Tuple[int, int], ModuleType]] = {}
+
+
+def _slotted_dataclass(cls: type) -> type:
+    """
+    Equivalent of ``@dataclass(slots=True)``, which needs Python 3.10.
+
+    On 3.9 the dataclass is rebuilt with ``__slots__`` for its fields, as
+    the 3.10 flag does; its generated ``__init__`` already holds the defaults.
+    """
+    if sys.version_info >= (3, 10):
+        return dataclass(slots=True)(cls)
+    cls = dataclass(cls)
+    names = tuple(f.name for f in fields(cls))
+    namespace = {k: v for k, v in cls.__dict__.items() if k not in names}
+    namespace.pop("__dict__", None)
+    namespace.pop("__weakref__", None)
+    namespace["__slots__"] = names
+    return type(cls)(cls.__name__, cls.__bases__, namespace)
+
+
+@_slotted_dataclass
 class DetectionResult:
     """Result of running a detection against an event."""
 
@@ -57,7 +84,7 @@ class DetectionResult:
         }
 
 
-@dataclass
+@_slotted_dataclass
 class Detection:
     """A loaded detection rule."""
 
@@ -71,9 +98,33 @@ class Detection:
     runbook_func: Optional[Callable[[Dict[str, Any]], str]] = None
     alert_context_func: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]] = None
     dedup_func: Optional[Callable[[Dict[str, Any]], str]] = None
+    rule_vectorized_func: Optional[Callable[[Any], Any]] = None
+    rule_prefilter_func: Optional[Callable[[Any], Any]] = None
+    severity_vectorized_func: Optional[Callable[[Any], Any]] = None
     log_types: List[str] = field(default_factory=list)
     enabled: bool = True
     tags: List[str] = field(default_factory=list)
+    # (field, value) pairs an event must have for rule_func to run at all
+    prefilter: Tuple[Tuple[str, Any], ...] = ()
+    # (result attribute, function) pairs to run on a match, resolved once
+    metadata_funcs: Tuple[Tuple[str, Callable[[Dict[str, Any]], Any]], ...] = field(
+        init=False, default=(), repr=False, compare=False
+    )
+
+    def __post_init__(self):
+        self.metadata_funcs = tuple(
+            (attr, func)
+            for attr, func in (
+                ("title", self.title_func),
+                ("severity", self.severity_func),
+                ("description", self.description_func),
+                ("reference", self.reference_func),
+                ("runbook", self.runbook_func),
+                ("alert_context", self.alert_context_func),
+                ("dedup_string", self.dedup_func),
+            )
+            if func is not None
+        )
 
     @property
     def default_severity(self) -> str:
@@ -90,15 +141,29 @@ class DetectionEngine:
         results = engine.run(events)
     """
 
-    def __init__(self, helpers_path: Optional[Path] = None):
+    def __init__(
+        self,
+        helpers_path: Optional[Path] = None,
+        collect_timings: bool = True,
+        collect_tracebacks: bool = False,
+    ):
         """
         Initialize the detection engine.
 
         Args:
             helpers_path: Optional path to custom helpers directory
+            collect_timings: Record execution_time_ms on each result. Disable
+                for bulk runs that don't report timings.
+            collect_tracebacks: Append the full traceback to a result's error
+                when a rule raises. Off by default because formatting the
+                stack is far slower than the rule call itself.
         """
         self.detections: Dict[str, Detection] = {}
         self.helpers_path = helpers_path
+        self.collect_timings = collect_timings
+        self.collect_tracebacks = collect_tracebacks
+        # Detections grouped by log type, rebuilt lazily after rules change
+        self._rules_by_log_type: Optional[Dict[str, List[Detection]]] = None
         self._setup_helpers()
 
     def _setup_helpers(self):
@@ -130,22 +195,22 @@ class DetectionEngine:
         # Generate rule ID from filename
         rule_id = rule_path.stem
 
-        # Load the module
-        spec = importlib.util.spec_from_file_location(rule_id, rule_path)
-        if spec is None or spec.loader is None:
-            raise ImportError(f"Cannot load rule from {rule_path}")
-
-        module = importlib.util.module_from_spec(spec)
-        sys.modules[rule_id] = module
+        # Reuse the module if this file was already loaded and is unchanged
+        cache_key = rule_path.resolve()
+        stat = rule_path.stat()
+        version = (stat.st_mtime_ns, stat.st_size)
+        cached = _MODULE_CACHE.get(cache_key)
+        if cached is not None and cached[0] == version:
+            module = cached[1]
+            sys.modules[rule_id] = module
+        else:
+            module = self._import_rule(rule_id, rule_path)
 
-        try:
-            spec.loader.exec_module(module)
-        except Exception as e:
-            raise ImportError(f"Error loading rule {rule_path}: {e}")
+            # Extract rule function (required)
+            if not hasattr(module, "rule"):
+                raise ValueError(f"Rule {rule_path} must define a 'rule' function")
 
-        # Extract rule function (required)
-        if not hasattr(module, "rule"):
-            raise ValueError(f"Rule {rule_path} must define a 'rule' function")
+            _MODULE_CACHE[cache_key] = (version, module)
 
         detection = Detection(
             rule_id=rule_id,
@@ -158,14 +223,35 @@ class DetectionEngine:
             runbook_func=getattr(module, "runbook", None),
             alert_context_func=getattr(module, "alert_context", None),
             dedup_func=getattr(module, "dedup", None),
+            rule_vectorized_func=getattr(module, "rule_vectorized", None),
+            rule_prefilter_func=getattr(module, "rule_prefilter", None),
+            severity_vectorized_func=getattr(module, "severity_vectorized", None),
             log_types=getattr(module, "LOG_TYPES", []),
             enabled=getattr(module, "ENABLED", True),
             tags=getattr(module, "TAGS", []),
+            prefilter=tuple((key, value) for key, value in getattr(module, "PREFILTER", ())),
         )
 
         self.detections[rule_id] = detection
+        self._rules_by_log_type = None
         return detection
 
+    def _import_rule(self, rule_id: str, rule_path: Path) -> ModuleType:
+        """Import a rule file as a module named after its rule ID."""
+        spec = importlib.util.spec_from_file_location(rule_id, rule_path)
+        if spec is None or spec.loader is None:
+            raise ImportError(f"Cannot load rule from {rule_path}")
+
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[rule_id] = module
+
+        try:
+            spec.loader.exec_module(module)
+        except Exception as e:
+            raise ImportError(f"Error loading rule {rule_path}: {e}")
+
+        return module
+
     def load_rules(self, rules_dir: Union[str, Path]) -> List[Detection]:
         """
         Load all detection rules from a directory.
@@ -192,6 +278,63 @@ class DetectionEngine:
 
         return loaded
 
+    def _build_log_type_index(self) -> Dict[str, List[Detection]]:
+        """
+        Group detections by the log types they apply to.
+
+        Each bucket keeps load order and already includes the rules that
+        declare no LOG_TYPES; those rules alone make up the "*" bucket used
+        for log types no rule declares.
+        """
+        detections = list(self.detections.values())
+        index = {"*": [d for d in detections if not d.log_types]}
+        for log_type in {lt for d in detections for lt in d.log_types}:
+            index[log_type] = [
+                d for d in detections if not d.log_types or log_type in d.log_types
+            ]
+        return index
+
+    def _detections_for_log_type(self, log_type: Optional[str]):
+        """Return the detections applicable to events of the given log type."""
+        if log_type is None:
+            return self.detections.values()
+        if self._rules_by_log_type is None:
+            self._rules_by_log_type = self._build_log_type_index()
+        index = self._rules_by_log_type
+        return index[log_type] if log_type in index else index["*"]
+
+    def _format_error(self, e: Exception) -> str:
+        """Describe an exception raised by a rule for DetectionResult.error."""
+        error = f"{type(e).__name__}: {e}"
+        if self.collect_tracebacks:
+            import traceback
+
+            error += "\n" + traceback.format_exc()
+        return error
+
+    def _populate_alert(
+        self,
+        detection: Detection,
+        event: Dict[str, Any],
+        result: DetectionResult,
+        severity: Optional[str] = None,
+    ) -> None:
+        """
+        Fill in alert metadata on a result whose rule matched.
+
+        A severity already computed for the event (by severity_vectorized)
+        is used as is instead of calling the rule's severity function.
+        """
+        if severity is None:
+            result.severity = detection.default_severity
+            for attr, func in detection.metadata_funcs:
+                setattr(result, attr, func(event))
+        else:
+            result.severity = severity
+            for attr, func in detection.metadata_funcs:
+                if attr != "severity":
+                    setattr(result, attr, func(event))
+
     def run_detection(
         self, detection: Detection, event: Dict[str, Any]
     ) -> DetectionResult:
@@ -205,65 +348,95 @@ class DetectionEngine:
         Returns:
             DetectionResult with match status and metadata
         """
-        start_time = datetime.now()
+        return self._evaluate_match(detection, event, include_non_matching=True)
 
-        # Initialize result
-        result = DetectionResult(
-            rule_id=detection.rule_id,
-            rule_file=str(detection.file_path),
-            matched=False,
-            event=event,
-        )
-
-        try:
-            # Run the rule function
-            matched = detection.rule_func(event)
-            result.matched = bool(matched)
+    def run_detection_batch(
+        self, detection: Detection, events: Iterable[Dict[str, Any]]
+    ) -> List[DetectionResult]:
+        """
+        Run a single detection against each of several events.
 
-            if result.matched:
-                # Extract additional metadata for alerts
-                if detection.title_func:
-                    result.title = detection.title_func(event)
+        Equivalent to calling ``run_detection`` once per event, without the
+        per-call dispatch.
 
-                if detection.severity_func:
-                    result.severity = detection.severity_func(event)
-                else:
-                    result.severity = detection.default_severity
+        Args:
+            detection: The detection rule to run
+            events: The events to analyze
 
-                if detection.description_func:
-                    result.description = detection.description_func(event)
+        Returns:
+            One DetectionResult per event, in order
+        """
+        evaluate = self._evaluate_match
+        return [evaluate(detection, event, True) for event in events]
 
-                if detection.reference_func:
-                    result.reference = detection.reference_func(event)
+    def _evaluate_match(
+        self, detection: Detection, event: Dict[str, Any], include_non_matching: bool
+    ) -> Optional[DetectionResult]:
+        """
+        Run a detection, building a result only when one will be kept.
 
-                if detection.runbook_func:
-                    result.runbook = detection.runbook_func(event)
+        With include_non_matching False, events the rule doesn't match (or
+        raises on) return None before any DetectionResult is allocated.
+        """
+        start_ns = time.perf_counter_ns() if self.collect_timings else 0
+
+        error = None
+        for key, value in detection.prefilter:
+            if event.get(key) != value:
+                matched = False
+                break
+        else:
+            try:
+                # Run the rule function
+                matched = bool(detection.rule_func(event))
+            except Exception as e:
+                matched = False
+                error = self._format_error(e)
 
-                if detection.alert_context_func:
-                    result.alert_context = detection.alert_context_func(event)
+        if not matched and not include_non_matching:
+            return None
 
-                if detection.dedup_func:
-                    result.dedup_string = detection.dedup_func(event)
+        result = DetectionResult(
+            rule_id=detection.rule_id,
+            rule_file=str(detection.file_path),
+            matched=matched,
+            event=event,
+            error=error,
+        )
 
-        except Exception as e:
-            result.error = f"{type(e).__name__}: {str(e)}\n{traceback.format_exc()}"
+        if matched:
+            try:
+                self._populate_alert(detection, event, result)
+            except Exception as e:
+                result.error = self._format_error(e)
 
         # Calculate execution time
-        result.execution_time_ms = (datetime.now() - start_time).total_seconds() * 1000
+        if self.collect_timings:
+            result.execution_time_ms = (time.perf_counter_ns() - start_ns) / 1_000_000
 
         return result
 
     def run(
         self,
-        events: Union[Dict[str, Any], List[Dict[str, Any]]],
+        events: Union[Dict[str, Any], Iterable[Dict[str, Any]]],
         rule_ids: Optional[List[str]] = None,
+        log_type_for: Optional[Callable[[Dict[str, Any]], Optional[str]]] = None,
+        include_non_matching: bool = True,
     ) -> List[DetectionResult]:
         """
         Run all loaded detections against event(s).
 
+        Only detections whose LOG_TYPES include the event's log type (or that
+        declare no LOG_TYPES) are run. The log type is read from the event's
+        ``p_log_type`` field unless ``log_type_for`` is given; events without
+        a known log type are checked against every detection.
+
         Args:
-            events: Single event or list of events
+            events: Single event or iterable of events
             rule_ids: Optional list of specific rule IDs to run
+            log_type_for: Optional callable returning an event's log type
+            include_non_matching: Also return results for events a rule
+                didn't match. When False, no result is built for them.
 
         Returns:
             List of DetectionResults
@@ -274,37 +447,317 @@ class DetectionEngine:
         results = []
 
         for event in events:
-            for rule_id, detection in self.detections.items():
+            log_type = log_type_for(event) if log_type_for else event.get("p_log_type")
+            for detection in self._detections_for_log_type(log_type):
                 # Skip if specific rules requested and this isn't one
-                if rule_ids and rule_id not in rule_ids:
+                if rule_ids and detection.rule_id not in rule_ids:
                     continue
 
                 # Skip disabled rules
                 if not detection.enabled:
                     continue
 
-                result = self.run_detection(detection, event)
+                result = self._evaluate_match(detection, event, include_non_matching)
+                if result is not None:
+                    results.append(result)
+
+        return results
+
+    def run_vectorized(
+        self,
+        events: Union[Dict[str, Any], List[Dict[str, Any]]],
+        rule_ids: Optional[List[str]] = None,
+        log_type_for: Optional[Callable[[Dict[str, Any]], Optional[str]]] = None,
+    ) -> List[DetectionResult]:
+        """
+        Run all loaded detections against a batch of events.
+
+        Rules that define ``rule_vectorized(df)`` are evaluated once for the
+        whole batch against a pandas DataFrame of the flattened events (nested
+        fields become dotted columns such as ``userIdentity.type``; batches
+        with a literal dot in any key use the scalar path) and must
+        return a boolean mask. Alert metadata is then built only for the
+        matching events; a rule can also define ``severity_vectorized(df)``
+        returning one severity per row to replace its per-event ``severity``
+        calls. Rules that can't be expressed exactly may instead define
+        ``rule_prefilter(df)``, a mask that is True for every event the rule
+        could match; ``rule`` then only runs on those events and the rest
+        are reported as non-matching. Rules without either variant, or whose
+        variant fails on this batch, use the scalar path. Without pandas
+        installed this behaves exactly like ``run``.
+
+        Args:
+            events: Single event or list of events
+            rule_ids: Optional list of specific rule IDs to run
+            log_type_for: Optional callable returning an event's log type
+
+        Returns:
+            List of DetectionResults, in the same order as ``run``
+        """
+        if isinstance(events, dict):
+            events = [events]
+        elif not isinstance(events, list):
+            events = list(events)
+
+        try:
+            import pandas as pd
+        except ImportError:
+            return self.run(events, rule_ids, log_type_for)
+
+        detections = [
+            detection
+            for rule_id, detection in self.detections.items()
+            if (not rule_ids or rule_id in rule_ids) and detection.enabled
+        ]
+
+        masks: Dict[str, Any] = {}
+        candidates: Dict[str, Any] = {}
+        severities: Dict[str, Any] = {}
+        df = None
+        if events and any(
+            d.rule_vectorized_func or d.rule_prefilter_func for d in detections
+        ):
+            df = _flatten_events(pd, events)
+        if df is not None:
+            for detection in detections:
+                mask = _batch_mask(detection.rule_vectorized_func, df, bool)
+                if mask is None:
+                    prefilter = _batch_mask(detection.rule_prefilter_func, df, bool)
+                    if prefilter is not None:
+                        candidates[detection.rule_id] = prefilter
+                    continue
+                masks[detection.rule_id] = mask
+
+                if mask.any():
+                    severity = _batch_mask(detection.severity_vectorized_func, df, object)
+                    if severity is not None:
+                        severities[detection.rule_id] = severity
+
+        results = []
+
+        for i, event in enumerate(events):
+            log_type = log_type_for(event) if log_type_for else event.get("p_log_type")
+            for detection in self._detections_for_log_type(log_type):
+                if rule_ids and detection.rule_id not in rule_ids:
+                    continue
+                if not detection.enabled:
+                    continue
+
+                mask = masks.get(detection.rule_id)
+                if mask is None:
+                    prefilter = candidates.get(detection.rule_id)
+                    if prefilter is None or prefilter[i]:
+                        results.append(self.run_detection(detection, event))
+                    else:
+                        results.append(
+                            DetectionResult(
+                                rule_id=detection.rule_id,
+                                rule_file=str(detection.file_path),
+                                matched=False,
+                                event=event,
+                            )
+                        )
+                    continue
+
+                result = DetectionResult(
+                    rule_id=detection.rule_id,
+                    rule_file=str(detection.file_path),
+                    matched=bool(mask[i]),
+                    event=event,
+                )
+                if result.matched:
+                    severity = severities.get(detection.rule_id)
+                    try:
+                        self._populate_alert(
+                            detection,
+                            event,
+                            result,
+                            None if severity is None else severity[i],
+                        )
+                    except Exception as e:
+                        result.error = self._format_error(e)
                 results.append(result)
 
         return results
 
+    def run_parallel(
+        self,
+        events: Union[Dict[str, Any], Iterable[Dict[str, Any]]],
+        rule_ids: Optional[List[str]] = None,
+        workers: Optional[int] = None,
+        chunk_size: int = 1000,
+        use_threads: bool = False,
+        log_type_for: Optional[Callable[[Dict[str, Any]], Optional[str]]] = None,
+    ) -> List[DetectionResult]:
+        """
+        Run all loaded detections against events across a pool of workers.
+
+        Events are split into chunks and each chunk is run through ``run`` in
+        a worker. Process workers load the same rule files once at startup,
+        so rule functions must be stateless (depend only on the event) and
+        ``log_type_for`` must be picklable. Results come back in the same
+        order as ``run``, but hold copies of the events rather than the
+        original objects. Threads avoid the copying and startup cost but only
+        help when rules spend their time in code that releases the GIL.
+
+        Args:
+            events: Single event or iterable of events
+            rule_ids: Optional list of specific rule IDs to run
+            workers: Number of workers (defaults to the CPU count)
+            chunk_size: Number of events handed to a worker at a time
+            use_threads: Use a thread pool instead of a process pool
+            log_type_for: Optional callable returning an event's log type
+
+        Returns:
+            List of DetectionResults
+        """
+        if isinstance(events, dict):
+            events = [events]
+
+        from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+        workers = workers or os.cpu_count() or 1
+        chunks = _chunked(events, chunk_size)
+
+        if use_threads:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                batches = list(
+                    executor.map(lambda chunk: self.run(chunk, rule_ids, log_type_for), chunks)
+                )
+        else:
+            rule_paths = [str(d.file_path) for d in self.detections.values()]
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_worker,
+                initargs=(
+                    rule_paths,
+                    self.helpers_path,
+                    self.collect_timings,
+                    self.collect_tracebacks,
+                ),
+            ) as executor:
+                batches = list(
+                    executor.map(
+                        _run_worker_chunk,
+                        chunks,
+                        itertools.repeat(rule_ids),
+                        itertools.repeat(log_type_for),
+                    )
+                )
+
+        return [result for batch in batches for result in batch]
+
     def run_matching(
         self,
-        events: Union[Dict[str, Any], List[Dict[str, Any]]],
+        events: Union[Dict[str, Any], Iterable[Dict[str, Any]]],
         rule_ids: Optional[List[str]] = None,
+        log_type_for: Optional[Callable[[Dict[str, Any]], Optional[str]]] = None,
     ) -> List[DetectionResult]:
         """
         Run detections and return only matching results.
 
         Args:
-            events: Single event or list of events
+            events: Single event or iterable of events
             rule_ids: Optional list of specific rule IDs to run
+            log_type_for: Optional callable returning an event's log type
 
         Returns:
             List of DetectionResults where matched=True
         """
-        all_results = self.run(events, rule_ids)
-        return [r for r in all_results if r.matched]
+        return self.run(events, rule_ids, log_type_for, include_non_matching=False)
+
+
+def _flatten_events(pd: Any, events: List[Dict[str, Any]]) -> Optional[Any]:
+    """
+    Flatten events into a DataFrame with dotted columns for nested fields.
+
+    Returns None when some key itself contains a dot, since its column could
+    not be told apart from a nested path (``{"userIdentity.type": ...}``
+    versus ``{"userIdentity": {"type": ...}}``).
+    """
+    # Flatten with a separator real keys don't use, then check for dots
+    df = pd.json_normalize(events, sep="\x1f")
+    columns = [str(column) for column in df.columns]
+    if any("." in column for column in columns):
+        return None
+    df.columns = [column.replace("\x1f", ".") for column in columns]
+    return df
+
+
+def _batch_mask(
+    func: Optional[Callable[[Any], Any]], df: Any, dtype: Any
+) -> Optional[Any]:
+    """
+    Evaluate a vectorized rule function over a batch DataFrame.
+
+    Returns a NumPy array with one value per row, or None when the function
+    is missing, raises (e.g. a column it needs is absent from this batch) or
+    returns the wrong shape.
+    """
+    if func is None:
+        return None
+    import numpy as np
+
+    try:
+        values = np.asarray(func(df), dtype=dtype)
+    except Exception:
+        return None
+    return values if values.shape == (len(df),) else None
+
+
+def _chunked(events: Iterable[Dict[str, Any]], size: int) -> Iterator[List[Dict[str, Any]]]:
+    """Yield successive lists of at most ``size`` events."""
+    iterator = iter(events)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+# Engine owned by each DetectionEngine.run_parallel worker process
+_WORKER_ENGINE: Optional[DetectionEngine] = None
+
+
+def _init_worker(
+    rule_paths: List[str],
+    helpers_path: Optional[Path],
+    collect_timings: bool,
+    collect_tracebacks: bool,
+) -> None:
+    """Load the parent engine's rules once per worker process."""
+    global _WORKER_ENGINE
+    _WORKER_ENGINE = DetectionEngine(
+        helpers_path,
+        collect_timings=collect_timings,
+        collect_tracebacks=collect_tracebacks,
+    )
+    for rule_path in rule_paths:
+        _WORKER_ENGINE.load_rule(rule_path)
+
+
+def _run_worker_chunk(
+    chunk: List[Dict[str, Any]],
+    rule_ids: Optional[List[str]],
+    log_type_for: Optional[Callable[[Dict[str, Any]], Optional[str]]],
+) -> List[DetectionResult]:
+    """Run one chunk of events in a worker process."""
+    return _WORKER_ENGINE.run(chunk, rule_ids, log_type_for)
+
+
+# Engine shared by the module-level convenience functions
+_default_engine: Optional[DetectionEngine] = None
+_default_engine_lock = threading.Lock()
+
+
+def _get_default_engine() -> DetectionEngine:
+    """Return the shared engine, creating it on first use."""
+    global _default_engine
+    if _default_engine is None:
+        with _default_engine_lock:
+            if _default_engine is None:
+                _default_engine = DetectionEngine()
+    return _default_engine
 
 
 def run_detection(
@@ -321,14 +774,14 @@ def run_detection(
     Returns:
         DetectionResult
     """
-    engine = DetectionEngine()
+    engine = _get_default_engine()
     detection = engine.load_rule(rule_path)
     return engine.run_detection(detection, event)
 
 
 def run_detections(
     rules_dir: Union[str, Path],
-    events: Union[Dict[str, Any], List[Dict[str, Any]]],
+    events: Union[Dict[str, Any], Iterable[Dict[str, Any]]],
 ) -> List[DetectionResult]:
     """
     Convenience function to run all rules in a directory against events.
@@ -340,39 +793,137 @@ def run_detections(
     Returns:
         List of DetectionResults
     """
-    engine = DetectionEngine()
-    engine.load_rules(rules_dir)
-    return engine.run(events)
+    engine = _get_default_engine()
+    loaded = engine.load_rules(rules_dir)
+    if not loaded:
+        return []
+    # The shared engine may hold rules from other calls; run only this directory's
+    return engine.run(events, rule_ids=[d.rule_id for d in loaded])
+
 
+# Longer strings are mostly high-cardinality values (ARNs, command lines)
+_INTERN_MAX_LEN = 64
 
-def load_events_from_file(file_path: Union[str, Path]) -> List[Dict[str, Any]]:
+
+def _intern_strings(value: Any) -> Any:
+    """Return a copy of a parsed JSON value with keys and short strings interned."""
+    if isinstance(value, dict):
+        return {sys.intern(k): _intern_strings(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_intern_strings(v) for v in value]
+    if isinstance(value, str) and len(value) < _INTERN_MAX_LEN:
+        return sys.intern(value)
+    return value
+
+
+def iter_events_from_file(
+    file_path: Union[str, Path], intern_strings: bool = False
+) -> Iterator[Dict[str, Any]]:
     """
-    Load events from a JSON or JSONL file.
+    Stream events from a JSON or JSONL file.
+
+    JSONL files are parsed one line at a time, so memory use doesn't grow
+    with the file. JSON arrays are streamed element by element when ijson
+    is installed and parsed whole otherwise; a single (possibly
+    multi-line) JSON object is always parsed whole.
 
     Args:
         file_path: Path to the file
+        intern_strings: Intern keys and short string values so rule lookups
+            and comparisons against literals can match on identity. This
+            costs an extra copy per event and only pays off when many rules
+            run against each event.
 
-    Returns:
-        List of event dictionaries
+    Yields:
+        Event dictionaries
     """
-    file_path = Path(file_path)
-    events = []
+    events = _iter_parsed_events(file_path, stream_arrays=True)
+    if intern_strings:
+        events = map(_intern_strings, events)
+    yield from events
 
-    with open(file_path, "r") as f:
-        content = f.read().strip()
 
-        # Try JSON array first
-        try:
-            data = json.loads(content)
-            if isinstance(data, list):
-                events = data
+def _json_loads() -> Callable[[bytes], Any]:
+    """Return orjson.loads when orjson is installed, else json.loads."""
+    try:
+        import orjson
+    except ImportError:
+        import json
+
+        return json.loads
+    return orjson.loads
+
+
+def _iter_parsed_events(
+    file_path: Union[str, Path], stream_arrays: bool
+) -> Iterator[Dict[str, Any]]:
+    """
+    Parse events from a JSON or JSONL file as they are read.
+
+    With stream_arrays, JSON arrays go through ijson (if installed), which
+    keeps memory flat but parses slower than a single orjson call.
+    """
+    import json
+
+    loads = _json_loads()
+
+    # Read as bytes: orjson parses UTF-8 directly, and json.loads accepts bytes
+    with open(file_path, "rb") as f:
+        first = b""
+        for line in f:
+            first = line.strip()
+            if first:
+                break
+        if not first:
+            return
+
+        # A JSONL file's first line is a complete document on its own
+        if not first.startswith(b"["):
+            try:
+                data = loads(first)
+            except json.JSONDecodeError:
+                pass
             else:
-                events = [data]
-        except json.JSONDecodeError:
-            # Try JSONL format
-            for line in content.split("\n"):
-                line = line.strip()
-                if line:
-                    events.append(json.loads(line))
-
-    return events
+                yield data
+                for line in f:
+                    line = line.strip()
+                    if line:
+                        yield loads(line)
+                return
+
+        if stream_arrays and first.startswith(b"["):
+            try:
+                import ijson
+            except ImportError:
+                pass
+            else:
+                f.seek(0)
+                yield from ijson.items(f, "item", use_float=True)
+                return
+
+        data = loads(first + b"\n" + f.read())
+        if isinstance(data, list):
+            yield from data
+        else:
+            yield data
+
+
+def load_events_from_file(
+    file_path: Union[str, Path], intern_strings: bool = False
+) -> List[Dict[str, Any]]:
+    """
+    Load events from a JSON or JSONL file.
+
+    Args:
+        file_path: Path to the file
+        intern_strings: Intern keys and short string values (see
+            iter_events_from_file)
+
+    Returns:
+        List of event dictionaries
+    """
+    # The list is built anyway, so arrays are parsed in one go
+    events = _iter_parsed_events(file_path, stream_arrays=False)
+    if intern_strings:
+        events = map(_intern_strings, events)
+    return list(events)
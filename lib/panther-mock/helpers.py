@@ -4,8 +4,11 @@ These mirror the built-in helpers available in Panther.
 """
 
 import fnmatch
+import functools
+import ipaddress
 import re
-from typing import Any, Dict, List, Optional, Union
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Union
 
 
 def deep_get(event: Dict[str, Any], *keys: str, default: Any = None) -> Any:
@@ -41,6 +44,45 @@ def deep_get(event: Dict[str, Any], *keys: str, default: Any = None) -> Any:
     return result if result is not None else default
 
 
+# Kept for parity tests against the compiled version
+_py_deep_get = deep_get
+
+# Prefer the compiled deep_get when the extension is built (make build-ext)
+try:
+    from ._helpers_c import deep_get  # noqa: F811
+except ImportError:
+    try:
+        from _helpers_c import deep_get  # noqa: F811
+    except ImportError:
+        pass
+
+
+def _iter_walk(obj: Any, keys: tuple, return_val: str) -> Iterator[Any]:
+    """
+    Yield what deep_walk would return, in the same order, without recursion.
+
+    Lists met before the path is exhausted are fanned out, each element
+    continuing with the same remaining keys.
+    """
+    depth = len(keys)
+    stack = [(obj, 0)]
+    while stack:
+        obj, i = stack.pop()
+        if i == depth:
+            if return_val == "key":
+                if isinstance(obj, dict):
+                    yield from obj.keys()
+            elif obj is not None:
+                yield obj
+        elif isinstance(obj, dict):
+            key = keys[i]
+            if key in obj:
+                stack.append((obj[key], i + 1))
+        elif isinstance(obj, list):
+            # Reversed so items come off the stack in list order
+            stack.extend((item, i) for item in reversed(obj))
+
+
 def deep_walk(
     event: Dict[str, Any],
     *keys: str,
@@ -63,28 +105,51 @@ def deep_walk(
         event = {"records": [{"id": 1}, {"id": 2}]}
         deep_walk(event, "records", "id")  # Returns [1, 2]
     """
-    def _walk(obj: Any, remaining_keys: tuple) -> List[Any]:
-        if not remaining_keys:
-            if return_val == "key":
-                return list(obj.keys()) if isinstance(obj, dict) else []
-            return [obj] if obj is not None else []
+    results = list(_iter_walk(event, keys, return_val))
+    return results if results else (default if default is not None else [])
 
-        key = remaining_keys[0]
-        rest = remaining_keys[1:]
 
-        if isinstance(obj, dict):
-            if key in obj:
-                return _walk(obj[key], rest)
-            return []
-        elif isinstance(obj, list):
-            results = []
-            for item in obj:
-                results.extend(_walk(item, remaining_keys))
-            return results
-        return []
+def deep_walk_first(
+    event: Dict[str, Any],
+    *keys: str,
+    default: Any = None,
+    return_val: str = "value"
+) -> Any:
+    """
+    Return the first value/key deep_walk would find, stopping as soon as it does.
 
-    results = _walk(event, keys)
-    return results if results else (default if default is not None else [])
+    Args:
+        event: The dictionary to search
+        *keys: Variable number of keys representing the path
+        default: Value to return if path doesn't exist
+        return_val: "value" to return values, "key" to return keys
+
+    Returns:
+        The first value/key found at the path, or default
+
+    Example:
+        event = {"records": [{"id": 1}, {"id": 2}]}
+        deep_walk_first(event, "records", "id")  # Returns 1
+    """
+    return next(_iter_walk(event, keys, return_val), default)
+
+
+@functools.lru_cache(maxsize=1024)
+def _compile_glob(pattern: str) -> "re.Pattern[str]":
+    """Compile a shell-style pattern to a regex once per pattern."""
+    return re.compile(fnmatch.translate(pattern))
+
+
+@functools.lru_cache(maxsize=256)
+def _compile_glob_list(patterns: tuple) -> tuple:
+    """
+    Split shell-style patterns into a set of literal strings and one fused
+    regex (or None) matching any of the wildcard patterns.
+    """
+    literals = frozenset(p for p in patterns if not any(c in p for c in "*?["))
+    globs = [p for p in patterns if p not in literals]
+    regex = re.compile("|".join(fnmatch.translate(p) for p in globs)) if globs else None
+    return literals, regex
 
 
 def pattern_match(string: str, pattern: str) -> bool:
@@ -104,7 +169,7 @@ def pattern_match(string: str, pattern: str) -> bool:
     """
     if string is None:
         return False
-    return fnmatch.fnmatch(str(string), pattern)
+    return _compile_glob(pattern).match(str(string)) is not None
 
 
 def pattern_match_list(string: str, patterns: List[str]) -> bool:
@@ -123,7 +188,27 @@ def pattern_match_list(string: str, patterns: List[str]) -> bool:
     """
     if string is None:
         return False
-    return any(pattern_match(string, p) for p in patterns)
+    literals, regex = _compile_glob_list(tuple(patterns))
+    string = str(string)
+    if string in literals:
+        return True
+    return regex is not None and regex.match(string) is not None
+
+
+_ip_address = ipaddress.ip_address
+_ip_network = ipaddress.ip_network
+
+
+@functools.lru_cache(maxsize=4096)
+def _parse_ip(ip: str) -> Union[ipaddress.IPv4Address, ipaddress.IPv6Address]:
+    """Parse an IP address string, caching repeat addresses."""
+    return _ip_address(ip)
+
+
+@functools.lru_cache(maxsize=256)
+def _parse_network(network: str) -> Union[ipaddress.IPv4Network, ipaddress.IPv6Network]:
+    """Parse a CIDR string, caching each network after its first use."""
+    return _ip_network(network, strict=False)
 
 
 def is_ip_in_network(ip: str, network: str) -> bool:
@@ -137,10 +222,9 @@ def is_ip_in_network(ip: str, network: str) -> bool:
     Returns:
         True if IP is in network range
     """
-    import ipaddress
     try:
-        return ipaddress.ip_address(ip) in ipaddress.ip_network(network, strict=False)
-    except ValueError:
+        return _parse_ip(ip) in _parse_network(network)
+    except (ValueError, TypeError):
         return False
 
 
@@ -165,6 +249,18 @@ def get_string_set(event: Dict[str, Any], key: str) -> set:
     return {str(value)}
 
 
+@functools.lru_cache(maxsize=8192)
+def _split_arn(arn: str) -> Optional[tuple]:
+    """Split an ARN into its five components, cached per ARN string."""
+    if not arn.startswith("arn:"):
+        return None
+
+    parts = arn.split(":", 5)
+    if len(parts) < 6:
+        return None
+    return tuple(parts[1:])
+
+
 def aws_arn_parse(arn: str) -> Optional[Dict[str, str]]:
     """
     Parse an AWS ARN into its components.
@@ -180,19 +276,20 @@ def aws_arn_parse(arn: str) -> Optional[Dict[str, str]]:
         aws_arn_parse("arn:aws:iam::123456789012:user/admin")
         # Returns {"partition": "aws", "service": "iam", ...}
     """
-    if not arn or not arn.startswith("arn:"):
+    if not arn or not isinstance(arn, str):
         return None
 
-    parts = arn.split(":", 5)
-    if len(parts) < 6:
+    parts = _split_arn(arn)
+    if parts is None:
         return None
 
+    partition, service, region, account, resource = parts
     return {
-        "partition": parts[1],
-        "service": parts[2],
-        "region": parts[3],
-        "account": parts[4],
-        "resource": parts[5],
+        "partition": partition,
+        "service": service,
+        "region": region,
+        "account": account,
+        "resource": resource,
     }
 
 
@@ -215,7 +312,20 @@ def aws_guardduty_context(event: Dict[str, Any]) -> Dict[str, Any]:
     }
 
 
-def time_parse(time_string: str) -> Optional[Any]:
+_TIME_FORMATS = (
+    "%Y-%m-%dT%H:%M:%S.%fZ",
+    "%Y-%m-%dT%H:%M:%SZ",
+    "%Y-%m-%dT%H:%M:%S%z",
+    "%Y-%m-%d %H:%M:%S",
+)
+
+# The first two formats, which cover CloudTrail and most other UTC logs
+_UTC_TIME_RE = re.compile(
+    r"([0-9]{4})-([0-9]{2})-([0-9]{2})T([0-9]{2}):([0-9]{2}):([0-9]{2})(?:\.([0-9]{1,6}))?Z\Z"
+)
+
+
+def time_parse(time_string: str) -> Optional[datetime]:
     """
     Parse a time string into a datetime object.
 
@@ -225,16 +335,19 @@ def time_parse(time_string: str) -> Optional[Any]:
     Returns:
         datetime object or None if parsing fails
     """
-    from datetime import datetime
-
-    formats = [
-        "%Y-%m-%dT%H:%M:%S.%fZ",
-        "%Y-%m-%dT%H:%M:%SZ",
-        "%Y-%m-%dT%H:%M:%S%z",
-        "%Y-%m-%d %H:%M:%S",
-    ]
-
-    for fmt in formats:
+    # Build UTC timestamps directly instead of trying strptime formats in turn
+    match = _UTC_TIME_RE.match(time_string) if isinstance(time_string, str) else None
+    if match is not None:
+        year, month, day, hour, minute, second, fraction = match.groups()
+        try:
+            return datetime(
+                int(year), int(month), int(day), int(hour), int(minute), int(second),
+                int(fraction.ljust(6, "0")) if fraction else 0,
+            )
+        except ValueError:
+            pass
+
+    for fmt in _TIME_FORMATS:
         try:
             return datetime.strptime(time_string, fmt)
         except (ValueError, TypeError):
@@ -242,6 +355,62 @@ def time_parse(time_string: str) -> Optional[Any]:
     return None
 
 
+class _NetworkSet:
+    """
+    Fixed set of networks with a membership test that doesn't scan them.
+
+    Networks are grouped by IP version and prefix length, each group being
+    a set of network prefixes as integers. An address is checked with one
+    shift and set lookup per distinct prefix length, however many networks
+    share that length.
+    """
+
+    def __init__(self, networks: List[str]):
+        groups: Dict[tuple, set] = {}
+        for net in networks:
+            network = _ip_network(net)
+            shift = network.max_prefixlen - network.prefixlen
+            groups.setdefault((network.version, shift), set()).add(
+                int(network.network_address) >> shift
+            )
+        self._groups = tuple(
+            (version, shift, frozenset(prefixes))
+            for (version, shift), prefixes in sorted(groups.items())
+        )
+
+    def __contains__(self, addr: Union[ipaddress.IPv4Address, ipaddress.IPv6Address]) -> bool:
+        value = int(addr)
+        version = addr.version
+        for group_version, shift, prefixes in self._groups:
+            if group_version == version and value >> shift in prefixes:
+                return True
+        return False
+
+
+# Override these based on your network configuration
+_DMZ_NETWORKS = _NetworkSet([
+    "10.0.0.0/8",
+    "172.16.0.0/12",
+    "192.168.0.0/16",
+])
+
+_PRIVATE_NETWORKS = _NetworkSet([
+    "10.0.0.0/8",
+    "172.16.0.0/12",
+    "192.168.0.0/16",
+    "127.0.0.0/8",
+])
+
+
+def _ip_in_any(ip: str, networks: _NetworkSet) -> bool:
+    """Check an IP address against a pre-built network set."""
+    try:
+        addr = _parse_ip(ip)
+    except (ValueError, TypeError):
+        return False
+    return addr in networks
+
+
 def is_dmz_ip(ip: str) -> bool:
     """
     Check if IP is in common DMZ/public ranges.
@@ -253,13 +422,7 @@ def is_dmz_ip(ip: str) -> bool:
     Returns:
         True if IP appears to be in DMZ
     """
-    # Override this based on your network configuration
-    dmz_ranges = [
-        "10.0.0.0/8",
-        "172.16.0.0/12",
-        "192.168.0.0/16",
-    ]
-    return any(is_ip_in_network(ip, net) for net in dmz_ranges)
+    return _ip_in_any(ip, _DMZ_NETWORKS)
 
 
 def is_internal_ip(ip: str) -> bool:
@@ -272,17 +435,12 @@ def is_internal_ip(ip: str) -> bool:
     Returns:
         True if IP is private/internal
     """
-    private_ranges = [
-        "10.0.0.0/8",
-        "172.16.0.0/12",
-        "192.168.0.0/16",
-        "127.0.0.0/8",
-    ]
-    return any(is_ip_in_network(ip, net) for net in private_ranges)
+    return _ip_in_any(ip, _PRIVATE_NETWORKS)
 
 
-# Commonly used lookup tables
-SENSITIVE_AWS_ACTIONS = {
+# Commonly used lookup tables. Frozen so the lowercased copy below can't
+# drift from them.
+SENSITIVE_AWS_ACTIONS = frozenset({
     "iam:CreateUser",
     "iam:CreateAccessKey",
     "iam:AttachUserPolicy",
@@ -298,14 +456,16 @@ SENSITIVE_AWS_ACTIONS = {
     "s3:PutBucketAcl",
     "kms:ScheduleKeyDeletion",
     "kms:DisableKey",
-}
+})
+
+_SENSITIVE_AWS_ACTIONS_LOWER = frozenset(a.lower() for a in SENSITIVE_AWS_ACTIONS)
 
-HIGH_RISK_PORTS = {22, 23, 3389, 5985, 5986, 445, 139, 1433, 3306, 5432, 27017, 6379}
+HIGH_RISK_PORTS = frozenset({22, 23, 3389, 5985, 5986, 445, 139, 1433, 3306, 5432, 27017, 6379})
 
 
 def is_sensitive_aws_action(action: str) -> bool:
     """Check if AWS action is considered sensitive."""
-    return action.lower() in {a.lower() for a in SENSITIVE_AWS_ACTIONS}
+    return action is not None and action.lower() in _SENSITIVE_AWS_ACTIONS_LOWER
 
 
 def is_high_risk_port(port: Union[int, str]) -> bool:
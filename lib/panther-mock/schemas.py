@@ -5,7 +5,7 @@ Mirrors Panther's built-in log types.
 
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Any, Dict, List, Optional, Set
+from typing import Any, ClassVar, Dict, FrozenSet, List, Optional, Set, Tuple
 
 
 class LogType(Enum):
@@ -51,11 +51,45 @@ class SchemaField:
 class LogSchema:
     """Definition of a log type schema."""
 
+    # Python type(s) accepted for each SchemaField.type
+    _TYPE_MAP: ClassVar[Dict[str, Any]] = {
+        "string": str,
+        "int": int,
+        "float": (int, float),
+        "bool": bool,
+        "object": dict,
+        "array": list,
+        "timestamp": str,  # ISO format strings
+    }
+
     log_type: LogType
     description: str
     fields: Dict[str, SchemaField] = field(default_factory=dict)
     required_fields: Set[str] = field(default_factory=set)
     timestamp_field: str = "timestamp"
+    # (field name, declared type, Python types) for each type-checked field,
+    # resolved once from fields
+    type_checks: Tuple[Tuple[str, str, Any], ...] = field(
+        init=False, default=(), repr=False, compare=False
+    )
+    # The same checks keyed by field name, for walking sparse events
+    _checks_by_field: Dict[str, Tuple[str, Any]] = field(
+        init=False, default_factory=dict, repr=False, compare=False
+    )
+    _required: FrozenSet[str] = field(
+        init=False, default=frozenset(), repr=False, compare=False
+    )
+
+    def __post_init__(self):
+        self.type_checks = tuple(
+            (name, field_def.type, self._TYPE_MAP[field_def.type])
+            for name, field_def in self.fields.items()
+            if field_def.type in self._TYPE_MAP
+        )
+        self._checks_by_field = {
+            name: (type_name, expected) for name, type_name, expected in self.type_checks
+        }
+        self._required = frozenset(self.required_fields)
 
     def validate(self, event: Dict[str, Any]) -> List[str]:
         """
@@ -67,19 +101,31 @@ class LogSchema:
         errors = []
 
         # Check required fields
-        for field_name in self.required_fields:
-            if field_name not in event:
-                errors.append(f"Missing required field: {field_name}")
-
-        # Type checking (basic)
-        for field_name, field_def in self.fields.items():
-            if field_name in event:
-                value = event[field_name]
-                if not self._check_type(value, field_def.type):
+        if not self._required.issubset(event):
+            for field_name in self._required:
+                if field_name not in event:
+                    errors.append(f"Missing required field: {field_name}")
+
+        # Type checking (basic), walking whichever of the event and the
+        # schema has fewer fields
+        checks = self._checks_by_field
+        if len(event) < len(checks):
+            for field_name, value in event.items():
+                check = checks.get(field_name)
+                if check is not None and value is not None and not isinstance(value, check[1]):
                     errors.append(
                         f"Field '{field_name}' has wrong type. "
-                        f"Expected {field_def.type}, got {type(value).__name__}"
+                        f"Expected {check[0]}, got {type(value).__name__}"
                     )
+        else:
+            for field_name, type_name, expected in self.type_checks:
+                if field_name in event:
+                    value = event[field_name]
+                    if value is not None and not isinstance(value, expected):
+                        errors.append(
+                            f"Field '{field_name}' has wrong type. "
+                            f"Expected {type_name}, got {type(value).__name__}"
+                        )
 
         return errors
 
@@ -88,25 +134,16 @@ class LogSchema:
         if value is None:
             return True
 
-        type_map = {
-            "string": str,
-            "int": int,
-            "float": (int, float),
-            "bool": bool,
-            "object": dict,
-            "array": list,
-            "timestamp": str,  # ISO format strings
-        }
-
-        expected = type_map.get(expected_type)
+        expected = self._TYPE_MAP.get(expected_type)
         if expected is None:
             return True
 
         return isinstance(value, expected)
 
 
-# Pre-defined schemas for common log types
+# Pre-defined schemas for common log types, filled in on first lookup
 SCHEMAS: Dict[LogType, LogSchema] = {}
+_SCHEMAS_READY = False
 
 
 def _init_schemas():
@@ -226,8 +263,13 @@ def _init_schemas():
     )
 
 
-# Initialize schemas on module load
-_init_schemas()
+def _ensure_schemas() -> None:
+    """Build the built-in schemas if they haven't been built yet."""
+    global _SCHEMAS_READY
+    if not _SCHEMAS_READY:
+        # Idempotent, so a concurrent first call only repeats the work
+        _init_schemas()
+        _SCHEMAS_READY = True
 
 
 def get_schema(log_type: LogType) -> Optional[LogSchema]:
@@ -240,6 +282,8 @@ def get_schema(log_type: LogType) -> Optional[LogSchema]:
     Returns:
         LogSchema or None if not defined
     """
+    if not _SCHEMAS_READY:
+        _ensure_schemas()
     return SCHEMAS.get(log_type)
 
 
@@ -254,9 +298,11 @@ def validate_event(event: Dict[str, Any], log_type: LogType) -> List[str]:
     Returns:
         List of validation errors (empty if valid)
     """
-    schema = get_schema(log_type)
-    if schema is None:
-        return []  # No schema defined, allow anything
+    if not _SCHEMAS_READY:
+        _ensure_schemas()
+    schema = SCHEMAS.get(log_type)
+    if schema is None or not (schema._required or schema.type_checks):
+        return []  # No schema defined or nothing to check, allow anything
     return schema.validate(event)
 
 
@@ -300,5 +346,6 @@ def add_custom_schema(
     )
 
     # Store with a custom key
+    _ensure_schemas()
     SCHEMAS[log_type_name] = schema
     return LogType.CUSTOM_JSON
@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""
+Build the optional Cython helpers for the panther-mock framework.
+Compiles lib/panther-mock/_helpers_c.pyx in place; requires Cython and a C compiler.
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+from Cython.Build import cythonize
+from setuptools import Extension, setup
+
+project_root = Path(__file__).parent.parent
+panther_mock_path = project_root / "lib" / "panther-mock"
+
+
+def main() -> int:
+    # Named explicitly: lib/panther-mock has an __init__.py but isn't an
+    # importable package name, which trips cythonize's module name lookup
+    extension = Extension("_helpers_c", [str(panther_mock_path / "_helpers_c.pyx")])
+
+    with tempfile.TemporaryDirectory() as build_temp:
+        setup(
+            name="panther-mock-helpers",
+            ext_modules=cythonize([extension], language_level=3),
+            script_args=[
+                "build_ext",
+                "--build-lib", str(panther_mock_path),
+                "--build-temp", build_temp,
+            ],
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,6 +6,7 @@ Run and test detection rules against sample events.
 
 import argparse
 import json
+import py_compile
 import sys
 from pathlib import Path
 from typing import List, Optional
@@ -18,35 +19,46 @@ sys.path.insert(0, str(script_dir / "detections" / "panther" / "helpers"))
 from engine import (
     DetectionEngine,
     DetectionResult,
+    iter_events_from_file,
     load_events_from_file,
     run_detection,
     run_detections,
 )
 
 
+# Color only when writing to a terminal, so piped output stays plain
+_USE_COLOR = sys.stdout.isatty()
+
+
 def print_result(result: DetectionResult, verbose: bool = False) -> None:
     """Print a detection result."""
     status = "✓ MATCH" if result.matched else "✗ NO MATCH"
-    color = "\033[92m" if result.matched else "\033[91m"
-    reset = "\033[0m"
+    if _USE_COLOR:
+        color = "\033[92m" if result.matched else "\033[91m"
+        status = f"{color}{status}\033[0m"
 
-    print(f"{color}{status}{reset} | {result.rule_id}")
+    # Collected and written at once: a terminal's line-buffered stdout
+    # flushes on every print
+    lines = [f"{status} | {result.rule_id}"]
 
     if result.error:
-        print(f"  └─ ERROR: {result.error}")
+        lines.append(f"  └─ ERROR: {result.error}")
+        print("\n".join(lines))
         return
 
     if result.matched:
         if result.title:
-            print(f"  └─ Title: {result.title}")
-        print(f"  └─ Severity: {result.severity}")
+            lines.append(f"  └─ Title: {result.title}")
+        lines.append(f"  └─ Severity: {result.severity}")
         if result.dedup_string:
-            print(f"  └─ Dedup: {result.dedup_string}")
+            lines.append(f"  └─ Dedup: {result.dedup_string}")
 
     if verbose:
-        print(f"  └─ Execution time: {result.execution_time_ms:.2f}ms")
+        lines.append(f"  └─ Execution time: {result.execution_time_ms:.2f}ms")
         if result.alert_context:
-            print(f"  └─ Context: {json.dumps(result.alert_context, indent=6)}")
+            lines.append(f"  └─ Context: {json.dumps(result.alert_context, indent=6)}")
+
+    print("\n".join(lines))
 
 
 def cmd_run(args: argparse.Namespace) -> int:
@@ -56,36 +68,40 @@ def cmd_run(args: argparse.Namespace) -> int:
         print(f"Error: Rule file not found: {rule_path}", file=sys.stderr)
         return 1
 
-    # Load events
+    # Load events; files are streamed so only one event is held at a time
     if args.event:
         events = [json.loads(args.event)]
+        source = "1 event"
     elif args.events_file:
         events_path = Path(args.events_file)
         if not events_path.exists():
             print(f"Error: Events file not found: {events_path}", file=sys.stderr)
             return 1
-        events = load_events_from_file(events_path)
+        events = iter_events_from_file(events_path)
+        source = events_path.name
     else:
         print("Error: Must provide --event or --events-file", file=sys.stderr)
         return 1
 
-    print(f"Running {rule_path.name} against {len(events)} event(s)...\n")
+    print(f"Running {rule_path.name} against {source}...\n")
 
-    engine = DetectionEngine()
+    engine = DetectionEngine(collect_tracebacks=args.verbose)
     detection = engine.load_rule(rule_path)
 
     matches = 0
+    total = 0
     for i, event in enumerate(events):
+        total += 1
         result = engine.run_detection(detection, event)
         if not args.quiet or result.matched:
-            if len(events) > 1:
+            if args.events_file:
                 print(f"Event #{i + 1}:")
             print_result(result, verbose=args.verbose)
             print()
         if result.matched:
             matches += 1
 
-    print(f"Results: {matches}/{len(events)} events matched")
+    print(f"Results: {matches}/{total} events matched")
     return 0 if matches > 0 else 1
 
 
@@ -99,7 +115,7 @@ def cmd_test(args: argparse.Namespace) -> int:
     events_dir = Path(args.events_dir) if args.events_dir else None
 
     print(f"Loading rules from {rules_dir}...")
-    engine = DetectionEngine()
+    engine = DetectionEngine(collect_tracebacks=args.verbose)
     detections = engine.load_rules(rules_dir)
     print(f"Loaded {len(detections)} detection(s)\n")
 
@@ -108,24 +124,36 @@ def cmd_test(args: argparse.Namespace) -> int:
         print("Validation complete. No events directory specified.")
         return 0
 
-    # Load all sample events
-    all_events = []
+    print(f"Running {len(detections)} detection(s) against events in {events_dir}...\n")
+
+    # One file at a time, keeping only matches, so memory is bounded by the
+    # largest file rather than the whole directory
+    matches = []
+    checks = 0
+    total_events = 0
     for events_file in events_dir.glob("*.json"):
         events = load_events_from_file(events_file)
-        all_events.extend(events)
         print(f"Loaded {len(events)} events from {events_file.name}")
-
-    print(f"\nRunning {len(detections)} detection(s) against {len(all_events)} event(s)...\n")
-
-    results = engine.run(all_events)
-    matches = [r for r in results if r.matched]
+        total_events += len(events)
+
+        if args.jobs > 1:
+            # About four chunks per worker to balance load against IPC cost
+            chunk_size = max(1, len(events) // (args.jobs * 4))
+            results = engine.run_parallel(events, workers=args.jobs, chunk_size=chunk_size)
+        else:
+            # Batched so rules with vectorized variants evaluate a file at once;
+            # this is the same as engine.run when pandas isn't installed
+            results = engine.run_vectorized(events)
+        checks += len(results)
+        matches.extend(r for r in results if r.matched)
+    print()
 
     if args.verbose or args.show_matches:
         for result in matches:
             print_result(result, verbose=args.verbose)
             print()
 
-    print(f"Results: {len(matches)} match(es) from {len(results)} checks")
+    print(f"Results: {len(matches)} match(es) from {checks} checks across {total_events} event(s)")
     return 0
 
 
@@ -140,12 +168,12 @@ def cmd_validate(args: argparse.Namespace) -> int:
 
     errors = []
     valid = 0
+    engine = DetectionEngine()
 
     for rule_file in rules_dir.glob("*.py"):
         if rule_file.name.startswith("_"):
             continue
         try:
-            engine = DetectionEngine()
             engine.load_rule(rule_file)
             valid += 1
             if args.verbose:
@@ -158,6 +186,31 @@ def cmd_validate(args: argparse.Namespace) -> int:
     return 0 if not errors else 1
 
 
+def cmd_precompile(args: argparse.Namespace) -> int:
+    """Write bytecode caches for detection rules ahead of time."""
+    rules_dir = Path(args.rules_dir)
+    if not rules_dir.exists():
+        print(f"Error: Rules directory not found: {rules_dir}", file=sys.stderr)
+        return 1
+
+    # Rule imports go through the normal source loader, which reads these
+    # __pycache__ files instead of recompiling unchanged rules
+    errors = 0
+    compiled = 0
+    for rule_file in rules_dir.glob("*.py"):
+        if rule_file.name.startswith("_"):
+            continue
+        try:
+            py_compile.compile(str(rule_file), doraise=True)
+            compiled += 1
+        except py_compile.PyCompileError as e:
+            errors += 1
+            print(f"  ✗ {rule_file.name}: {e.msg}")
+
+    print(f"Precompiled {compiled} rule(s), {errors} error(s)")
+    return 0 if not errors else 1
+
+
 def cmd_list(args: argparse.Namespace) -> int:
     """List available detections."""
     rules_dir = Path(args.rules_dir)
@@ -197,11 +250,17 @@ Examples:
   # Test all rules in a directory
   %(prog)s test detections/panther/rules/ -e logs/samples/
 
+  # Spread a large test run over 4 worker processes
+  %(prog)s test detections/panther/rules/ -e logs/samples/ -j 4
+
   # Validate rule syntax
   %(prog)s validate detections/panther/rules/
 
   # List available detections
   %(prog)s list detections/panther/rules/
+
+  # Write rule bytecode caches ahead of time (e.g. in a CI image build)
+  %(prog)s precompile detections/panther/rules/
         """,
     )
 
@@ -221,6 +280,10 @@ Examples:
     test_parser.add_argument("-e", "--events-dir", help="Path to events directory")
     test_parser.add_argument("-v", "--verbose", action="store_true", help="Verbose output")
     test_parser.add_argument("-m", "--show-matches", action="store_true", help="Show matching results")
+    test_parser.add_argument(
+        "-j", "--jobs", type=int, default=1,
+        help="Run events across N worker processes (default: 1)",
+    )
 
     # Validate command
     validate_parser = subparsers.add_parser("validate", help="Validate detection rules")
@@ -231,6 +294,12 @@ Examples:
     list_parser = subparsers.add_parser("list", help="List available detections")
     list_parser.add_argument("rules_dir", help="Path to rules directory")
 
+    # Precompile command
+    precompile_parser = subparsers.add_parser(
+        "precompile", help="Write bytecode caches for detection rules"
+    )
+    precompile_parser.add_argument("rules_dir", help="Path to rules directory")
+
     args = parser.parse_args()
 
     if not args.command:
@@ -242,6 +311,7 @@ Examples:
         "test": cmd_test,
         "validate": cmd_validate,
         "list": cmd_list,
+        "precompile": cmd_precompile,
     }
 
     return commands[args.command](args)
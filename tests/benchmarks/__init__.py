@@ -0,0 +1 @@
+# Detection Benchmarks
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for running detection rules over batches of events.
+
+Not collected by a plain `pytest` run; use `make bench`, which runs
+`pytest tests/benchmarks/ --benchmark-only` (needs pytest-benchmark).
+"""
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+# Events per benchmark round; each list mixes matching and non-matching events
+BATCH_SIZE = 1000
+
+ROOT_LOGIN_EVENTS = [
+    {
+        "eventName": "ConsoleLogin",
+        "userIdentity": {"type": "Root"},
+        "sourceIPAddress": "203.0.113.50",
+        "additionalEventData": {"MFAUsed": "No"},
+    },
+    {
+        "eventName": "ConsoleLogin",
+        "userIdentity": {"type": "IAMUser", "userName": "admin"},
+        "sourceIPAddress": "10.0.0.1",
+    },
+    {"eventName": "DescribeInstances", "userIdentity": {"type": "Root"}},
+    {"eventName": "GetObject", "userIdentity": {"type": "AssumedRole"}},
+]
+
+ACCESS_KEY_EVENTS = [
+    {
+        "eventName": "CreateAccessKey",
+        "userIdentity": {"type": "IAMUser", "arn": "arn:aws:iam::123456789012:user/admin"},
+        "requestParameters": {"userName": "other-user"},
+    },
+    {"eventName": "CreateAccessKey", "errorCode": "AccessDenied"},
+    {"eventName": "ListUsers", "userIdentity": {"type": "IAMUser"}},
+    {"eventName": "GetObject", "userIdentity": {"type": "AssumedRole"}},
+]
+
+SUSPICIOUS_PROCESS_EVENTS = [
+    {
+        "EventID": 1,
+        "Image": "C:\\Windows\\System32\\WindowsPowerShell\\v1.0\\powershell.exe",
+        "CommandLine": "powershell.exe -encodedcommand SQBFAFgA...",
+        "ParentImage": "C:\\Program Files\\Microsoft Office\\root\\Office16\\WINWORD.EXE",
+        "User": "DESKTOP\\user",
+        "Computer": "DESKTOP-ABC",
+    },
+    {
+        "EventID": 1,
+        "Image": "C:\\Windows\\System32\\cmd.exe",
+        "CommandLine": "cmd.exe /c dir C:\\Users\\Public",
+        "ParentImage": "C:\\Windows\\explorer.exe",
+    },
+    {
+        "EventID": 1,
+        "Image": "C:\\Windows\\System32\\notepad.exe",
+        "CommandLine": "notepad.exe C:\\notes.txt",
+    },
+    {"EventID": 3, "Image": "C:\\Windows\\System32\\svchost.exe", "DestinationIp": "1.2.3.4"},
+]
+
+
+def _batch(events):
+    return (events * (BATCH_SIZE // len(events) + 1))[:BATCH_SIZE]
+
+
+def _bench_run_detection(benchmark, engine, detection, events):
+    """Time run_detection once per event over a BATCH_SIZE batch."""
+    batch = _batch(events)
+    run_detection = engine.run_detection
+    results = benchmark(lambda: [run_detection(detection, event) for event in batch])
+    assert len(results) == BATCH_SIZE
+    assert any(r.matched for r in results)
+
+
+def test_bench_root_login(benchmark, engine, root_login_rule):
+    _bench_run_detection(benchmark, engine, root_login_rule, ROOT_LOGIN_EVENTS)
+
+
+def test_bench_access_key_created(benchmark, engine, access_key_rule):
+    _bench_run_detection(benchmark, engine, access_key_rule, ACCESS_KEY_EVENTS)
+
+
+def test_bench_suspicious_process(benchmark, engine, suspicious_process_rule):
+    _bench_run_detection(benchmark, engine, suspicious_process_rule, SUSPICIOUS_PROCESS_EVENTS)
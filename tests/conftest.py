@@ -0,0 +1,53 @@
+"""
+Shared pytest setup for every test suite.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+# Make the panther-mock library and detection helpers importable, once per run
+for path in (
+    PROJECT_ROOT / "lib" / "panther-mock",
+    PROJECT_ROOT / "detections" / "panther" / "helpers",
+):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+
+@pytest.fixture(scope="session")
+def project_root():
+    return PROJECT_ROOT
+
+
+@pytest.fixture(scope="session")
+def rules_dir(project_root):
+    return project_root / "detections" / "panther" / "rules"
+
+
+# Session-scoped so the engine is built and each rule loaded once per run.
+# engine is imported here rather than at module level, so runs that don't
+# use these fixtures (e.g. only test_helpers.py) never import it.
+@pytest.fixture(scope="session")
+def engine():
+    from engine import DetectionEngine
+
+    return DetectionEngine()
+
+
+@pytest.fixture(scope="session")
+def root_login_rule(engine, rules_dir):
+    return engine.load_rule(rules_dir / "aws_root_login.py")
+
+
+@pytest.fixture(scope="session")
+def access_key_rule(engine, rules_dir):
+    return engine.load_rule(rules_dir / "aws_iam_access_key_created.py")
+
+
+@pytest.fixture(scope="session")
+def suspicious_process_rule(engine, rules_dir):
+    return engine.load_rule(rules_dir / "sysmon_suspicious_process.py")
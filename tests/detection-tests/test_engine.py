@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the detection engine.
+"""
+
+import importlib.util
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+from engine import (
+    Detection,
+    DetectionEngine,
+    DetectionResult,
+    iter_events_from_file,
+    load_events_from_file,
+    run_detection,
+    run_detections,
+)
+
+RULES_DIR = Path(__file__).resolve().parents[2] / "detections" / "panther" / "rules"
+
+
+class TestLogTypeDispatch(unittest.TestCase):
+    """Tests for routing events to rules by log type."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.engine = DetectionEngine()
+        cls.engine.load_rules(RULES_DIR)
+
+    def test_tagged_event_only_runs_matching_rules(self):
+        """Should only run rules declaring the event's p_log_type."""
+        event = {"p_log_type": "Custom.Sysmon", "EventID": 1}
+        results = self.engine.run(event)
+        self.assertEqual([r.rule_id for r in results], ["sysmon_suspicious_process"])
+
+    def test_untagged_event_runs_all_rules(self):
+        """Should run every rule when the log type is unknown."""
+        results = self.engine.run({"eventName": "ConsoleLogin"})
+        self.assertEqual(len(results), len(self.engine.detections))
+
+    def test_log_type_for_callable(self):
+        """Should use the supplied log type resolver."""
+        results = self.engine.run(
+            {"eventName": "ConsoleLogin"},
+            log_type_for=lambda event: "AWS.CloudTrail",
+        )
+        self.assertEqual(
+            sorted(r.rule_id for r in results),
+            ["aws_iam_access_key_created", "aws_root_login"],
+        )
+
+    def test_run_matching_skips_non_matching_results(self):
+        """run_matching should return exactly the matched results of run."""
+        events = [
+            {"eventName": "ConsoleLogin", "userIdentity": {"type": "Root"}},
+            {"eventName": "DescribeInstances"},
+        ]
+        expected = [(r.rule_id, r.title) for r in self.engine.run(events) if r.matched]
+        matches = self.engine.run_matching(events)
+        self.assertEqual([(r.rule_id, r.title) for r in matches], expected)
+        self.assertEqual(expected, [("aws_root_login", "AWS Root Console Login from unknown")])
+
+    def test_run_detection_batch_matches_run_detection(self):
+        """Should return one result per event, as run_detection would."""
+        detection = self.engine.detections["aws_root_login"]
+        events = [
+            {"eventName": "ConsoleLogin", "userIdentity": {"type": "Root"}},
+            {"eventName": "DescribeInstances"},
+        ]
+        batch = self.engine.run_detection_batch(detection, iter(events))
+        single = [self.engine.run_detection(detection, event) for event in events]
+        self.assertEqual(
+            [(r.matched, r.title, r.event) for r in batch],
+            [(r.matched, r.title, r.event) for r in single],
+        )
+        self.assertEqual([r.matched for r in batch], [True, False])
+
+    def test_unknown_log_type_runs_no_typed_rules(self):
+        """Should skip rules whose LOG_TYPES don't include the event's type."""
+        results = self.engine.run({"p_log_type": "Okta.SystemLog"})
+        self.assertEqual(results, [])
+
+
+class TestRunParallel(unittest.TestCase):
+    """Tests for running events across a worker pool."""
+
+    EVENTS = [
+        {"eventName": "ConsoleLogin", "userIdentity": {"type": "Root"}},
+        {"eventName": "CreateAccessKey", "userIdentity": {"type": "IAMUser"}},
+        {
+            "EventID": 1,
+            "Image": "C:\\Windows\\System32\\cmd.exe",
+            "CommandLine": "cmd.exe /c whoami",
+            "ParentImage": "C:\\Program Files\\Microsoft Office\\root\\Office16\\EXCEL.EXE",
+        },
+    ] * 5
+
+    @classmethod
+    def setUpClass(cls):
+        cls.engine = DetectionEngine()
+        cls.engine.load_rules(RULES_DIR)
+        cls.expected = [(r.rule_id, r.matched) for r in cls.engine.run(cls.EVENTS)]
+
+    def test_process_pool_matches_serial_run(self):
+        """Process workers should produce the same results in the same order."""
+        results = self.engine.run_parallel(self.EVENTS, workers=2, chunk_size=4)
+        self.assertEqual([(r.rule_id, r.matched) for r in results], self.expected)
+
+    def test_thread_pool_matches_serial_run(self):
+        """Thread workers should produce the same results in the same order."""
+        results = self.engine.run_parallel(
+            self.EVENTS, workers=2, chunk_size=4, use_threads=True
+        )
+        self.assertEqual([(r.rule_id, r.matched) for r in results], self.expected)
+
+
+class TestRuleModuleCache(unittest.TestCase):
+    """Tests for reusing imported rule modules across loads."""
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.rule_path = Path(tmp.name) / "cached_rule.py"
+        self.rule_path.write_text("def rule(event):\n    return True\n")
+
+    def test_unchanged_rule_is_not_reimported(self):
+        """Loading the same unchanged file should reuse its module."""
+        first = DetectionEngine().load_rule(self.rule_path)
+        second = DetectionEngine().load_rule(self.rule_path)
+        self.assertIs(first.rule_func, second.rule_func)
+
+    def test_modified_rule_is_reimported(self):
+        """Loading a file after it changes should pick up the new code."""
+        engine = DetectionEngine()
+        engine.load_rule(self.rule_path)
+        self.rule_path.write_text("def rule(event):\n    return False\n")
+        detection = engine.load_rule(self.rule_path)
+        self.assertFalse(detection.rule_func({}))
+
+    def test_modified_rule_with_preserved_mtime_is_reimported(self):
+        """Should notice a size change even when the mtime is unchanged."""
+        engine = DetectionEngine()
+        stat = self.rule_path.stat()
+        engine.load_rule(self.rule_path)
+        self.rule_path.write_text("def rule(event):\n    return False\n")
+        os.utime(self.rule_path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        detection = engine.load_rule(self.rule_path)
+        self.assertFalse(detection.rule_func({}))
+
+
+class TestRuleErrors(unittest.TestCase):
+    """Tests for how rule exceptions are reported."""
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.rule_path = Path(tmp.name) / "raising_rule.py"
+        self.rule_path.write_text("def rule(event):\n    return event['missing']\n")
+
+    def test_error_without_traceback_by_default(self):
+        """Should record only the exception type and message."""
+        engine = DetectionEngine()
+        result = engine.run_detection(engine.load_rule(self.rule_path), {})
+        self.assertFalse(result.matched)
+        self.assertEqual(result.error, "KeyError: 'missing'")
+
+    def test_error_with_traceback(self):
+        """Should append the traceback when asked to."""
+        engine = DetectionEngine(collect_tracebacks=True)
+        result = engine.run_detection(engine.load_rule(self.rule_path), {})
+        self.assertTrue(result.error.startswith("KeyError: 'missing'\nTraceback"))
+
+    def test_prefilter_skips_rule(self):
+        """Events failing PREFILTER shouldn't reach rule()."""
+        self.rule_path.write_text(
+            "PREFILTER = [('eventName', 'Match')]\n"
+            "def rule(event):\n    return event['missing']\n"
+        )
+        engine = DetectionEngine()
+        detection = engine.load_rule(self.rule_path)
+        skipped, checked = engine.run_detection_batch(
+            detection, [{"eventName": "Other"}, {"eventName": "Match"}]
+        )
+        self.assertEqual((skipped.matched, skipped.error), (False, None))
+        self.assertEqual(checked.error, "KeyError: 'missing'")
+
+
+class TestSlots(unittest.TestCase):
+    """Tests that detections and results are slotted on every Python version."""
+
+    def test_no_instance_dict(self):
+        """Should store fields in slots rather than a per-instance __dict__."""
+        detection = Detection(rule_id="r", file_path=Path("r.py"), rule_func=bool)
+        result = DetectionResult(rule_id="r", rule_file="r.py", matched=False, event={})
+        for obj in (detection, result):
+            with self.subTest(type=type(obj).__name__):
+                self.assertFalse(hasattr(obj, "__dict__"))
+        self.assertEqual(result.severity, "MEDIUM")
+        self.assertEqual(detection.tags, [])
+
+
+class TestConvenienceFunctions(unittest.TestCase):
+    """Tests for the module-level run_detection/run_detections helpers."""
+
+    def test_run_detections_only_runs_rules_from_its_directory(self):
+        """Rules loaded by earlier calls shouldn't leak into later ones."""
+        with tempfile.TemporaryDirectory() as tmp:
+            rule_path = Path(tmp) / "always_matches.py"
+            rule_path.write_text("def rule(event):\n    return True\n")
+            self.assertTrue(run_detection(rule_path, {}).matched)
+
+        results = run_detections(RULES_DIR, {"eventName": "DescribeInstances"})
+        self.assertEqual(
+            sorted(r.rule_id for r in results),
+            ["aws_iam_access_key_created", "aws_root_login", "sysmon_suspicious_process"],
+        )
+
+
+class TestLoadEventsFromFile(unittest.TestCase):
+    """Tests for reading events from JSON and JSONL files."""
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.tmp_dir = Path(tmp.name)
+
+    def test_json_array(self):
+        """Should return every element of a JSON array."""
+        path = self.tmp_dir / "events.json"
+        path.write_text('[{"eventName": "ConsoleLogin"}, {"eventName": "Ünïcode"}]\n')
+        self.assertEqual(
+            load_events_from_file(path),
+            [{"eventName": "ConsoleLogin"}, {"eventName": "Ünïcode"}],
+        )
+
+    def test_single_object(self):
+        """Should wrap a single JSON object in a list."""
+        path = self.tmp_dir / "event.json"
+        path.write_text('{"EventID": 1}')
+        self.assertEqual(load_events_from_file(path), [{"EventID": 1}])
+
+    def test_jsonl(self):
+        """Should parse one event per line and skip blank lines."""
+        path = self.tmp_dir / "events.jsonl"
+        path.write_text('{"EventID": 1}\n\n{"EventID": 3}\n')
+        self.assertEqual(load_events_from_file(path), [{"EventID": 1}, {"EventID": 3}])
+
+    def test_multiline_object(self):
+        """Should parse a pretty-printed object whose first line isn't valid JSON."""
+        path = self.tmp_dir / "event.json"
+        path.write_text('{\n  "EventID": 1,\n  "Image": "cmd.exe"\n}\n')
+        self.assertEqual(load_events_from_file(path), [{"EventID": 1, "Image": "cmd.exe"}])
+
+    def test_intern_strings(self):
+        """Interned events should equal plain ones and share key objects."""
+        path = self.tmp_dir / "events.jsonl"
+        path.write_text('{"eventName": "ConsoleLogin", "userIdentity": {"type": "Root"}}\n')
+        plain = load_events_from_file(path)
+        interned = load_events_from_file(path, intern_strings=True)
+        self.assertEqual(interned, plain)
+        key = next(iter(interned[0]))
+        self.assertIs(key, sys.intern("eventName"))
+        self.assertIs(interned[0]["eventName"], sys.intern("ConsoleLogin"))
+
+    @unittest.skipUnless(importlib.util.find_spec("ijson"), "ijson not installed")
+    def test_iter_streams_json_array(self):
+        """Streamed arrays should match a whole-file parse, floats included."""
+        path = self.tmp_dir / "events.json"
+        path.write_text('[\n  {"EventID": 1, "score": 0.5},\n  {"EventID": 3, "tags": []}\n]\n')
+        streamed = list(iter_events_from_file(path))
+        self.assertEqual(streamed, load_events_from_file(path))
+        self.assertIsInstance(streamed[0]["score"], float)
+
+    def test_iter_streams_into_run(self):
+        """Should feed a lazily parsed file straight into the engine."""
+        path = self.tmp_dir / "events.jsonl"
+        path.write_text('{"eventName": "ConsoleLogin", "userIdentity": {"type": "Root"}}\n')
+        engine = DetectionEngine()
+        engine.load_rules(RULES_DIR)
+        matches = engine.run_matching(iter_events_from_file(path))
+        self.assertEqual([r.rule_id for r in matches], ["aws_root_login"])
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the Panther helper functions.
+"""
+
+import unittest
+from datetime import datetime, timedelta, timezone
+
+import helpers
+from helpers import (
+    aws_arn_parse,
+    deep_walk,
+    deep_walk_first,
+    is_dmz_ip,
+    is_internal_ip,
+    is_ip_in_network,
+    is_sensitive_aws_action,
+    pattern_match,
+    pattern_match_list,
+    time_parse,
+)
+
+
+try:
+    import _helpers_c
+except ImportError:
+    _helpers_c = None
+
+
+class _OverridingDict(dict):
+    """Dict subclass whose .get ignores the stored items."""
+
+    def get(self, key, default=None):
+        return "overridden"
+
+
+class TestDeepGetParity(unittest.TestCase):
+    """Tests that the compiled deep_get behaves like the pure-Python one."""
+
+    CASES = [
+        ({"a": {"b": [1, {"c": 2}]}}, ("a", "b", 1, "c")),
+        ({"a": {"b": None}}, ("a", "b")),
+        ({"a": [1]}, ("a", 5)),
+        ({"a": "text"}, ("a", "b")),
+        (_OverridingDict(a=1), ("a",)),
+        ({"a": _OverridingDict(b=1)}, ("a", "b")),
+    ]
+
+    def implementations(self):
+        yield helpers._py_deep_get
+        if _helpers_c is not None:
+            yield _helpers_c.deep_get
+
+    def test_same_results(self):
+        """Should return the same value from either implementation."""
+        for deep_get in self.implementations():
+            for event, keys in self.CASES:
+                with self.subTest(impl=deep_get.__module__, keys=keys):
+                    self.assertEqual(
+                        deep_get(event, *keys, default="N/A"),
+                        helpers._py_deep_get(event, *keys, default="N/A"),
+                    )
+
+    def test_unhashable_key_raises(self):
+        """Should raise TypeError for an unhashable key, like dict.get."""
+        for deep_get in self.implementations():
+            with self.subTest(impl=deep_get.__module__):
+                with self.assertRaises(TypeError):
+                    deep_get({"a": 1}, ["x"])
+
+
+class TestDeepWalk(unittest.TestCase):
+    """Tests for walking nested dicts and arrays."""
+
+    EVENT = {
+        "records": [
+            {"id": 1, "tags": [{"k": "a"}, {"k": "b"}]},
+            [{"id": 2}, {"id": None}],
+            {"other": 3},
+            {"id": 4, "tags": {"k": "c"}},
+        ]
+    }
+
+    def test_values_in_order(self):
+        """Should fan out through nested arrays, keeping document order."""
+        self.assertEqual(deep_walk(self.EVENT, "records", "id"), [1, 2, 4])
+        self.assertEqual(deep_walk(self.EVENT, "records", "tags", "k"), ["a", "b", "c"])
+
+    def test_keys(self):
+        """Should return the keys of the dicts at the path."""
+        self.assertEqual(deep_walk(self.EVENT, "records", "tags", return_val="key"), ["k"])
+
+    def test_missing_path(self):
+        """Should return the default, or an empty list without one."""
+        self.assertEqual(deep_walk(self.EVENT, "missing"), [])
+        self.assertEqual(deep_walk(self.EVENT, "missing", default="N/A"), "N/A")
+
+    def test_first(self):
+        """Should return only the first value found."""
+        self.assertEqual(deep_walk_first(self.EVENT, "records", "id"), 1)
+        self.assertIsNone(deep_walk_first(self.EVENT, "records", "missing"))
+        self.assertEqual(deep_walk_first(self.EVENT, "missing", default=0), 0)
+
+
+class TestIPHelpers(unittest.TestCase):
+    """Tests for the IP range helpers."""
+
+    def test_is_ip_in_network(self):
+        """Should check containment and reject unparseable input."""
+        self.assertTrue(is_ip_in_network("10.1.2.3", "10.0.0.0/8"))
+        self.assertTrue(is_ip_in_network("10.1.2.3", "10.0.0.1/8"))
+        self.assertFalse(is_ip_in_network("11.1.2.3", "10.0.0.0/8"))
+        self.assertFalse(is_ip_in_network("not-an-ip", "10.0.0.0/8"))
+        self.assertFalse(is_ip_in_network(None, "10.0.0.0/8"))
+
+    def test_is_internal_ip(self):
+        """Should match RFC 1918 and loopback ranges at their edges."""
+        for ip in ["10.0.0.0", "10.255.255.255", "172.16.0.1", "172.31.255.255",
+                   "192.168.1.1", "127.0.0.1"]:
+            self.assertTrue(is_internal_ip(ip), ip)
+        for ip in ["9.255.255.255", "11.0.0.0", "172.15.255.255", "172.32.0.0",
+                   "192.169.0.1", "8.8.8.8", "::1", "", None]:
+            self.assertFalse(is_internal_ip(ip), ip)
+
+    def test_is_dmz_ip(self):
+        """Should match private ranges but not loopback."""
+        self.assertTrue(is_dmz_ip("172.20.0.5"))
+        self.assertFalse(is_dmz_ip("127.0.0.1"))
+        self.assertFalse(is_dmz_ip("203.0.113.50"))
+
+
+
+class TestPatternHelpers(unittest.TestCase):
+    """Tests for the shell-style pattern helpers."""
+
+    def test_pattern_match(self):
+        """Should match whole strings against * and ? wildcards."""
+        self.assertTrue(pattern_match("GetSecretValue", "Get*"))
+        self.assertTrue(pattern_match("GetItem", "Get?tem"))
+        self.assertFalse(pattern_match("PutItem", "Get*"))
+        self.assertFalse(pattern_match("xGetItem", "Get*"))
+        self.assertTrue(pattern_match(123, "1*"))
+        self.assertFalse(pattern_match(None, "*"))
+
+    def test_pattern_match_list(self):
+        """Should match if any pattern matches."""
+        patterns = ["Get*", "Describe*"]
+        self.assertTrue(pattern_match_list("DescribeInstances", patterns))
+        self.assertFalse(pattern_match_list("PutItem", patterns))
+        self.assertFalse(pattern_match_list("PutItem\nGetItem", patterns))
+        self.assertFalse(pattern_match_list("anything", []))
+        self.assertFalse(pattern_match_list(None, patterns))
+
+    def test_pattern_match_list_literals(self):
+        """Literal patterns should match exactly, alone or mixed with globs."""
+        self.assertTrue(pattern_match_list("ListUsers", ["ListUsers", "GetUser"]))
+        self.assertFalse(pattern_match_list("ListUsersX", ["ListUsers", "GetUser"]))
+        self.assertTrue(pattern_match_list("GetRole", ["ListUsers", "Get*"]))
+        self.assertTrue(pattern_match_list("ListUsers", ["ListUsers", "Get*"]))
+        self.assertTrue(pattern_match_list("a1", ["a[0-9]"]))
+
+
+class TestLookupHelpers(unittest.TestCase):
+    """Tests for the lookup-table helpers."""
+
+    def test_is_sensitive_aws_action(self):
+        """Should match listed actions case-insensitively."""
+        self.assertTrue(is_sensitive_aws_action("iam:CreateAccessKey"))
+        self.assertTrue(is_sensitive_aws_action("IAM:CREATEACCESSKEY"))
+        self.assertFalse(is_sensitive_aws_action("iam:ListUsers"))
+        self.assertFalse(is_sensitive_aws_action(None))
+
+    def test_aws_arn_parse(self):
+        """Should split ARNs and return a fresh dict on repeated calls."""
+        arn = "arn:aws:iam::123456789012:role/service-role/My:Role"
+        result = aws_arn_parse(arn)
+        self.assertEqual(
+            result,
+            {
+                "partition": "aws",
+                "service": "iam",
+                "region": "",
+                "account": "123456789012",
+                "resource": "role/service-role/My:Role",
+            },
+        )
+        result["service"] = "changed"
+        self.assertEqual(aws_arn_parse(arn)["service"], "iam")
+        for value in ["arn:aws:iam", "not-an-arn", "", None]:
+            self.assertIsNone(aws_arn_parse(value), value)
+
+
+class TestTimeParse(unittest.TestCase):
+    """Tests for parsing log timestamps."""
+
+    def test_utc_formats(self):
+        """Should parse Z timestamps, with or without fractional seconds."""
+        self.assertEqual(time_parse("2024-01-15T10:30:00Z"), datetime(2024, 1, 15, 10, 30))
+        self.assertEqual(
+            time_parse("2024-01-15T10:30:00.12Z"), datetime(2024, 1, 15, 10, 30, 0, 120000)
+        )
+
+    def test_other_formats(self):
+        """Should fall back to the offset and space-separated formats."""
+        self.assertEqual(
+            time_parse("2024-01-15T10:30:00+0200"),
+            datetime(2024, 1, 15, 10, 30, tzinfo=timezone(timedelta(hours=2))),
+        )
+        self.assertEqual(time_parse("2024-01-15 10:30:00"), datetime(2024, 1, 15, 10, 30))
+        self.assertEqual(time_parse("2024-1-5T10:30:00Z"), datetime(2024, 1, 5, 10, 30))
+
+    def test_invalid(self):
+        """Should return None for unparseable input."""
+        for value in ["2024-02-30T10:30:00Z", "2024-01-15T10:30:00.1234567Z", "x", "", None]:
+            self.assertIsNone(time_parse(value), value)
